@@ -4,7 +4,6 @@
 # `from mongodb import *` and then `connect('testdb')`.
 from mongodb.connection import connect, disconnect
 from mongodb.document import Document
-from mongodb.rest_framework.serializers import DocumentSerializer
 
 __all__ = (
     "connect",
@@ -12,3 +11,13 @@ __all__ = (
     "Document",
     "DocumentSerializer"
 )
+
+
+def __getattr__(name):
+    # `DocumentSerializer` pulls in Django REST framework, so it is only
+    # imported once it is accessed.
+    if name == "DocumentSerializer":
+        from mongodb.rest_framework.serializers import DocumentSerializer
+
+        return DocumentSerializer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,12 @@
+import functools
+
 from mongodb.errors import NotRegistered
 
 _document_registry = {}
 
+# Maximum number of results kept by each per-class cache, see `class_cached`
+CLASS_CACHE_SIZE = 1024
+
 
 def get_document(name):
     """Get a registered Document class by name."""
@@ -38,3 +43,29 @@ def _get_documents_by_db(connection_alias, default_connection_alias):
         for doc_cls in _document_registry.values()
         if get_doc_alias(doc_cls) == connection_alias
     ]
+
+
+def class_cached(func):
+    """Cache the results of `func(cls, key)` in a dict stored on `cls` itself
+    (not shared with its subclasses), so that it goes away with the class,
+    unlike a module-level ``lru_cache`` keyed on it. The cache is emptied
+    once it holds ``CLASS_CACHE_SIZE`` results. Exceptions aren't cached.
+    """
+    attr = f"_{func.__name__.lstrip('_')}_cache"
+
+    @functools.wraps(func)
+    def wrapper(cls, key):
+        try:
+            return cls.__dict__[attr][key]
+        except (AttributeError, KeyError):
+            pass
+        if cls is None:
+            return func(cls, key)
+        cache = cls.__dict__.get(attr)
+        if cache is None or len(cache) >= CLASS_CACHE_SIZE:
+            cache = {}
+            setattr(cls, attr, cache)
+        result = cache[key] = func(cls, key)
+        return result
+
+    return wrapper
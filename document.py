@@ -32,19 +32,21 @@ class Document(BaseDocument, metaclass=TopLevelDocumentMetaclass):
     in the :attr:`meta` dictionary.
     """
     my_metaclass = TopLevelDocumentMetaclass
-    __slots__ = ("__objects",)
+    __slots__ = ("__objects", "_object_key_cache")
+
+    # Name of the primary key field, set in TopLevelDocumentMetaclass
+    _id_field_name = None
 
     @property
     def pk(self):
         """Get the primary key."""
-        if "id_field" not in self._meta:
-            return None
-        return getattr(self, self._meta["id_field"])
+        id_field = self._id_field_name
+        return getattr(self, id_field) if id_field else None
 
     @pk.setter
     def pk(self, value):
         """Set the primary key."""
-        return setattr(self, self._meta["id_field"], value)
+        return setattr(self, self._id_field_name, value)
 
     def __hash__(self):
         """Return the hash based on the PK of this document. If it's new
@@ -104,16 +106,18 @@ class Document(BaseDocument, metaclass=TopLevelDocumentMetaclass):
             database matches the query
         :param update: Django-style update keyword arguments
         """
-        if query is None:
-            query = {}
-
         if self.pk is None:
             raise InvalidDocumentError(
                 "The document does not have a primary key.")
 
-        id_field = self._meta["id_field"]
-        query = query.copy() if isinstance(query, dict) \
-            else query.to_query(self)
+        id_field = self._id_field_name
+        # Only copy a query dict owned by the caller
+        if query is None:
+            query = {}
+        elif isinstance(query, dict):
+            query = query.copy()
+        else:
+            query = query.to_query(self)
 
         if id_field not in query:
             query[id_field] = self.pk
@@ -175,7 +179,7 @@ class Document(BaseDocument, metaclass=TopLevelDocumentMetaclass):
         if write_concern is None:
             write_concern = {}
 
-        doc_id = self.to_mongo(fields=[self._meta["id_field"]])
+        doc_id = self.to_mongo(fields=[self._id_field_name])
         created = "_id" not in doc_id or self._created or force_insert
         doc = self.to_mongo()
         # TODO: Validation check should be performed only on changed fields
@@ -213,7 +217,7 @@ class Document(BaseDocument, metaclass=TopLevelDocumentMetaclass):
             raise OperationError(message % err) from err
 
         # Make sure we store the PK on this document now that it's saved
-        id_field = self._meta["id_field"]
+        id_field = self._id_field_name
         if created:
             self[id_field] = self._fields[id_field].to_python(object_id)
 
@@ -225,9 +229,11 @@ class Document(BaseDocument, metaclass=TopLevelDocumentMetaclass):
     def _remove_null_values(self, d):
         """Recursively removing keys with None values from a dictionary."""
         if isinstance(d, dict):
-            return {k: self._remove_null_values(v) if isinstance(v, (dict, list)) else v for k, v in d.items() if v is not None}
+            remove = self._remove_null_values
+            return {k: remove(v) if isinstance(v, (dict, list)) else v for k, v in d.items() if v is not None}
         elif isinstance(d, list):
-            return [self._remove_null_values(item) if isinstance(item, (dict, list)) else item for item in d if item is not None]
+            remove = self._remove_null_values
+            return [remove(item) if isinstance(item, (dict, list)) else item for item in d if item is not None]
         else:
             return d
 
@@ -281,10 +287,16 @@ class Document(BaseDocument, metaclass=TopLevelDocumentMetaclass):
 
         Helper method, should only be used inside save().
         """
-        collection = self._get_collection()
         object_id = doc["_id"]
         created = False
 
+        # Nothing was changed since the document was loaded or last saved,
+        # so there is no delta to compute or send.
+        if hasattr(self, "_changed_fields") and not self._changed_fields:
+            return object_id, created
+
+        collection = self._get_collection()
+
         select_dict = {}
         if save_condition is not None:
             select_dict = transform.query(self.__class__, **save_condition)
@@ -323,8 +335,15 @@ class Document(BaseDocument, metaclass=TopLevelDocumentMetaclass):
 
         Note that the dict returned by this method uses mongodb field
         names instead of PyMongo field names (e.g. "pk" instead of "_id").
+        The dict is cached on the instance once the primary key is known.
         """
-        return {"pk": self.pk}
+        pk = self.pk
+        object_key = getattr(self, "_object_key_cache", None)
+        if object_key is None or object_key["pk"] is not pk:
+            object_key = {"pk": pk}
+            if pk is not None:
+                self._object_key_cache = object_key
+        return object_key
 
     def update(self, **kwargs):
         """Performs an update on the :class:`~mongodb.Document`
@@ -295,6 +295,9 @@ class TopLevelDocumentMetaclass(DocumentMetaclass):
             # the first field).
             new_class._fields_ordered = (id_name,) + new_class._fields_ordered
 
+        # Cache the primary key field name for fast `pk` access
+        new_class._id_field_name = new_class._meta["id_field"]
+
         # Merge in exceptions with parent hierarchy.
         exceptions_to_merge = (DoesNotExist, MultipleObjectsReturned)
         module = attrs.get("__module__")
@@ -12,6 +12,25 @@ from mongodb.queryset.transform import STRING_OPERATORS
 
 RECURSIVE_REFERENCE_CONSTANT = "self"
 
+# Regex template for each string operator; None means the value is
+# already a regex. The "i"-prefixed variants are case insensitive.
+_STRING_OPERATOR_TEMPLATES = {
+    "contains": r"%s",
+    "startswith": r"^%s",
+    "endswith": r"%s$",
+    "exact": r"^%s$",
+    "wholeword": r"\b%s\b",
+    "regex": None,
+}
+# Maps each of STRING_OPERATORS to its (flags, regex template) pair
+STRING_OPERATOR_REGEXES = {
+    **{op: (0, regex) for op, regex in _STRING_OPERATOR_TEMPLATES.items()},
+    **{
+        f"i{op}": (re.IGNORECASE, regex)
+        for op, regex in _STRING_OPERATOR_TEMPLATES.items()
+    },
+}
+
 
 class ObjectIdField(BaseField):
     """A field wrapper around MongoDB's ObjectIds."""
@@ -23,12 +42,12 @@ class ObjectIdField(BaseField):
         return value
 
     def to_mongo(self, value):
-        if not isinstance(value, ObjectId):
-            try:
-                return ObjectId(str(value))
-            except Exception as e:
-                self.error(str(e))
-        return value
+        if isinstance(value, ObjectId):
+            return value
+        value = value if isinstance(value, str) else str(value)
+        if ObjectId.is_valid(value):
+            return ObjectId(value)
+        self.error(f"'{value}' is not a valid ObjectId")
 
     def prepare_query_value(self, op, value):
         return self.to_mongo(value)
@@ -56,9 +75,12 @@ class IntegerField(BaseField):
         super().__init__(**kwargs)
 
     def to_python(self, value):
-        with contextlib.suppress(TypeError, ValueError):
-            value = int(value)
-        return value
+        if type(value) is int:
+            return value
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return value
 
     def validate(self, value):
         try:
@@ -98,9 +120,10 @@ class CharField(BaseField):
     def to_python(self, value):
         if isinstance(value, str):
             return value
-        with contextlib.suppress(Exception):
-            value = value.decode("utf-8")
-        return value
+        try:
+            return value.decode("utf-8")
+        except Exception:
+            return value
 
     def validate(self, value):
         if not isinstance(value, str):
@@ -122,24 +145,13 @@ class CharField(BaseField):
         if not isinstance(op, str):
             return value
 
-        if op in STRING_OPERATORS:
-            case_insensitive = op.startswith("i")
-            op = op.lstrip("i")
-
-            flags = re.IGNORECASE if case_insensitive else 0
-
-            regex = r"%s"
-            operator_regex_map = {"startswith": r"^%s", "endswith": r"%s$",
-                                  "exact": r"^%s$", "wholeword": r"\b%s\b",
-                                  "regex": value}
-            regex = operator_regex_map.get(op) or regex
-
-            if op == "regex":
-                value = re.compile(regex, flags)
+        if strategy := STRING_OPERATOR_REGEXES.get(op):
+            flags, regex = strategy
+            if regex is None:
+                value = re.compile(value, flags)
             else:
                 # escape unsafe characters which could lead to a re.error
-                value = re.escape(value)
-                value = re.compile(regex % value, flags)
+                value = re.compile(regex % re.escape(value), flags)
         return super().prepare_query_value(op, value)
 
 
@@ -184,9 +196,12 @@ class BooleanField(BaseField):
     """Boolean field type."""
 
     def to_python(self, value):
-        with contextlib.suppress(ValueError, TypeError):
-            value = bool(value)
-        return value
+        if type(value) is bool:
+            return value
+        try:
+            return bool(value)
+        except (ValueError, TypeError):
+            return value
 
     def validate(self, value):
         if not isinstance(value, bool):
@@ -209,9 +224,12 @@ class FloatField(BaseField):
         super().__init__(**kwargs)
 
     def to_python(self, value):
-        with contextlib.suppress(ValueError):
-            value = float(value)
-        return value
+        if type(value) is float:
+            return value
+        try:
+            return float(value)
+        except ValueError:
+            return value
 
     def validate(self, value):
         if isinstance(value, int):
@@ -246,7 +264,7 @@ class ListField(ComplexBaseField):
 
     def __init__(self, field=None, max_length=None, **kwargs):
         self.max_length = max_length
-        kwargs.setdefault("default", lambda: [])
+        kwargs.setdefault("default", list)
         super().__init__(field=field, **kwargs)
 
     def __get__(self, instance, owner):
@@ -306,7 +324,7 @@ class DictField(ComplexBaseField):
     """
 
     def __init__(self, field=None, *args, **kwargs):
-        kwargs.setdefault("default", lambda: {})
+        kwargs.setdefault("default", dict)
         super().__init__(*args, field=field, **kwargs)
 
     def validate(self, value):
@@ -325,9 +343,7 @@ class DictField(ComplexBaseField):
         return DictField(db_field=member_name)
 
     def prepare_query_value(self, op, value):
-        match_operators = [*STRING_OPERATORS]
-
-        if op in match_operators and isinstance(value, str):
+        if op in STRING_OPERATORS and isinstance(value, str):
             return CharField().prepare_query_value(op, value)
 
         if hasattr(
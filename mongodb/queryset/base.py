@@ -1,17 +1,26 @@
-import contextlib
 import copy
-import itertools
+import functools
+import operator
 import re
 import warnings
 from collections.abc import Mapping
 
+import bson
+from bson import SON, json_util
+from bson.json_util import JSONMode
 import pymongo
 import pymongo.errors
-from bson import SON, json_util
 from pymongo.collection import ReturnDocument
 from pymongo.common import validate_read_preference
 from pymongo.read_concern import ReadConcern
-
+# orjson is optional, see `BaseQuerySet.to_json`
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from mongodb.base.common import class_cached
+from mongodb.base.document import BaseDocument
 from mongodb.context_managers import set_read_write_concern, set_write_concern
 from mongodb.errors import (BulkWriteError, InvalidQueryError, LookUpError,
                             NotUniqueError, OperationError)
@@ -21,12 +30,156 @@ from mongodb.queryset.field_list import QueryFieldList
 from mongodb.queryset.visitor import Q, QNode
 
 
+PROJECTION_OPERATORS = frozenset({"slice", "elemMatch"})
+
+# Batch sizes below this one are ignored unless forced, see `batch_size`
+MIN_BATCH_SIZE = 1000
+
+# JSON modes whose output orjson reproduces, see `BaseQuerySet.to_json`
+_ORJSON_JSON_MODES = frozenset({JSONMode.LEGACY, JSONMode.RELAXED})
+
+# Queryset properties carried over to a clone
+_CLONED_PROPS = (
+    "_mongo_query",
+    "_cls_query",
+    "_none",
+    "_query_obj",
+    "_where_clause",
+    "_loaded_fields",
+    "_ordering",
+    "_timeout",
+    "_allow_disk_use",
+    "_read_preference",
+    "_read_concern",
+    "_read_collection_cache",
+    "_iter",
+    "_scalar",
+    "_scalar_getter",
+    "_as_pymongo",
+    "_limit",
+    "_skip",
+    "_empty",
+    "_search_text",
+    "_text_filter",
+    "_batch_size",
+)
+# Values which don't need to be copied when cloning a queryset
+_IMMUTABLE_TYPES = (int, bool, str, type(None), tuple, frozenset, float, bytes)
+
+
+def _copy_value(value):
+    """Return a shallow copy of a queryset property value."""
+    value_type = type(value)
+    if value_type is dict:
+        return value.copy()
+    if value_type is list:
+        return value[:]
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    return copy.copy(value)
+
+
+# Copy functions for the queryset properties holding mutable objects, which
+# have to be copied when cloning. All the others are immutable and are
+# shared as is.
+_PROP_COPIERS = {
+    "_mongo_query": _copy_value,
+    "_cls_query": _copy_value,
+    "_query_obj": operator.methodcaller("clone"),
+    "_loaded_fields": operator.methodcaller("clone"),
+    "_ordering": _copy_value,
+}
+# (property, copy function or None) pairs, in the order they are cloned
+_CLONED_PROP_COPIERS = tuple(
+    (prop, _PROP_COPIERS.get(prop)) for prop in _CLONED_PROPS
+)
+
+
+def _set_default_json_options(kwargs):
+    """Fall back to LEGACY_JSON_OPTIONS if no json_options are given."""
+    if "json_options" not in kwargs:
+        warnings.warn(
+            "No 'json_options' are specified! Falling back to "
+            "LEGACY_JSON_OPTIONS with uuid_representation=PYTHON_LEGACY. "
+            "For use with other MongoDB drivers specify the UUID "
+            "representation to use.",
+            DeprecationWarning,
+        )
+        kwargs["json_options"] = LEGACY_JSON_OPTIONS
+
+
+def _raw_field_value(field, son):
+    """Return the value of `field` in a raw document, the way it's read from
+    a document instance built from it.
+    """
+    value = son.get(field.db_column)
+    if value is not None:
+        return field.to_python(value)
+    if field.null or field.default is None:
+        return None
+    return field.default() if callable(field.default) else field.default
+
+
+# [~fieldname] and {{~fieldname}} placeholders, see `_sub_js_fields`
+_JS_FIELD_RE = re.compile(r"\[\s*~([A-z_][A-z_0-9.]+?)\s*\]")
+_JS_FIELD_PATH_RE = re.compile(r"\{\{\s*~([A-z_][A-z_0-9.]+?)\s*\}\}")
+
+
+@class_cached
+def _db_field_path(document, path):
+    """Translate a dotted field path to its db equivalent for the given
+    document class. The result only depends on its arguments, so it is
+    cached on the document class.
+    """
+    return ".".join(
+        f if isinstance(f, str) else f.db_column
+        for f in document._lookup_field(path.split("."))
+    )
+
+
+@class_cached
+def _parse_order_by(document, keys):
+    """Translate sort keys to PyMongo sorting tuples for the given document
+    class, see `BaseQuerySet._get_order_by`. The result only depends on its
+    arguments, so it is cached on the document class.
+    """
+    key_list = []
+    for key in keys:
+        if not key:
+            continue
+
+        if key == "$text_score":
+            key_list.append(("_text_score", {"$meta": "textScore"}))
+            continue
+
+        direction = pymongo.ASCENDING
+        if key[0] == "-":
+            direction = pymongo.DESCENDING
+
+        if key[0] in ("-", "+"):
+            key = key[1:]
+
+        key = key.replace("__", ".")
+        try:
+            key = document._translate_field_name(key)
+        except Exception:
+            pass
+        key_list.append((key, direction))
+
+    return tuple(key_list)
+
+
 class BaseQuerySet:
     """A set of results returned from a query. Wraps a MongoDB cursor,
     providing :class:`~mongodb.Document` objects as the results.
     """
 
     __dereference = False
+    _inplace = False
+    # Function returning the next result, see `_set_next_result`
+    _next_result = None
+    # Cached `_cursor_args`, reset by the methods changing them
+    _cursor_args_cache = None
 
     def __init__(self, document, collection):
         self._document = document
@@ -41,11 +194,14 @@ class BaseQuerySet:
         self._allow_disk_use = False
         self._read_preference = None
         self._read_concern = None
+        self._read_collection_cache = None
         self._iter = False
         self._scalar = []
+        self._scalar_getter = None
         self._none = False
         self._as_pymongo = False
         self._search_text = None
+        self._text_filter = None
         self._cursor_obj = None
         self._limit = None
         self._skip = None
@@ -70,11 +226,13 @@ class BaseQuerySet:
                     Did you intend to use key=value?""")
             query &= q_obj
 
-        queryset = self.clone()
+        queryset = self._chain()
         queryset._query_obj &= query
         queryset._mongo_query = {
             '$nor': [
                 queryset._query_obj.to_query(queryset._document)]} if negate_query else None
+        if negate_query and queryset._text_filter:
+            queryset._mongo_query.update(queryset._text_filter)
         queryset._cursor_obj = None
 
         return queryset
@@ -89,6 +247,7 @@ class BaseQuerySet:
 
         # don't pickle cursor
         obj_dict["_cursor_obj"] = None
+        obj_dict["_read_collection_cache"] = None
 
         return obj_dict
 
@@ -106,10 +265,10 @@ class BaseQuerySet:
         bounds into a skip and a limit, and return a cloned queryset
         with that skip/limit applied.
         """
-        queryset = self.clone()
-        queryset._empty = False
-
         if isinstance(key, slice):
+            # Always work on a real copy, even for an in-place queryset
+            queryset = self._copy()
+            queryset._empty = False
             queryset._cursor_obj = queryset._cursor[key]
             queryset._skip, queryset._limit = key.start, key.stop
             if key.start and key.stop:
@@ -120,21 +279,23 @@ class BaseQuerySet:
             # Allow further QuerySet modifications to be performed
             return queryset
 
-        # Handle an index
+        # Handle an index. Only the cursor has to be copied for that (so
+        # that one being iterated isn't disturbed), not the whole queryset.
         elif isinstance(key, int):
-            if queryset._scalar:
-                return queryset._get_scalar(
-                    queryset._document._from_son(
-                        queryset._cursor[key],
-                    )
+            if self._cursor_obj is not None:
+                cursor = self._cursor_obj.clone()
+            else:
+                cursor = self._cursor
+
+            if self._scalar:
+                return self._get_scalar(
+                    self._document._from_son(cursor[key])
                 )
 
-            if queryset._as_pymongo:
-                return queryset._cursor[key]
+            if self._as_pymongo:
+                return cursor[key]
 
-            return queryset._document._from_son(
-                queryset._cursor[key],
-            )
+            return self._document._from_son(cursor[key])
 
         raise TypeError("Provide a slice or an integer index")
 
@@ -143,8 +304,16 @@ class BaseQuerySet:
 
     def _has_data(self):
         """Return True if cursor has any data."""
-        queryset = self.order_by()
-        return queryset.first() is not None
+        if self._none or self._empty:
+            return False
+
+        if self._where_clause:
+            # The $where clause is only applied on cursors
+            return self._scratch().order_by().first() is not None
+
+        # Only fetch the _id of the first match
+        return self._read_collection.find_one(
+            self._query, {"_id": 1}, skip=self._skip or 0) is not None
 
     def __bool__(self):
         """Avoid to open all records in an if stmt in Py3."""
@@ -178,10 +347,12 @@ class BaseQuerySet:
         if language:
             query_kwargs["$language"] = language
 
-        queryset._query_obj &= Q(__raw__={"$text": query_kwargs})
+        # Kept out of the Q tree and merged into the compiled query instead
+        queryset._text_filter = {"$text": query_kwargs}
         queryset._mongo_query = None
         queryset._cursor_obj = None
         queryset._search_text = text
+        queryset._cursor_args_cache = None
 
         return queryset
 
@@ -194,25 +365,31 @@ class BaseQuerySet:
         queryset = queryset.order_by().limit(2)
         queryset = queryset.filter(*q_objs, **query)
 
-        try:
-            result = next(queryset)
-            result._cursor = queryset._cursor
-        except StopIteration as e:
+        # Fetch at most 2 documents in a single batch, which is enough to
+        # tell whether there are no, one or multiple matches.
+        cursor = queryset._cursor
+        raw_docs = [] if queryset._none else list(cursor)
+
+        if not raw_docs:
             raise queryset._document.DoesNotExist(
                 f"""{queryset._document._class_name} matching
                 query doesn't exist."""
-            ) from e
+            )
 
-        try:
-            # Check if there is another match
-            next(queryset)
-        except StopIteration:
-            return result
+        if len(raw_docs) > 1:
+            raise queryset._document.MultipleObjectsReturned(
+                "2 or more items returned, instead of 1")
+
+        if queryset._as_pymongo:
+            return raw_docs[0]
 
-        """If we were able to retrieve the 2nd doc,
-        raise the MultipleObjectsReturned exception."""
-        raise queryset._document.MultipleObjectsReturned(
-            "2 or more items returned, instead of 1")
+        result = queryset._document._from_son(raw_docs[0])
+        if queryset._scalar:
+            return queryset._get_scalar(result)
+
+        # Keep the cursor around for Document.explain()
+        result._cursor = cursor
+        return result
 
     def create(self, **kwargs):
         """Create new object. Returns the saved object instance."""
@@ -250,16 +427,16 @@ class BaseQuerySet:
         docs = doc_or_docs
         return_one = False
         raw = []
-        from mongodb.document import Document
-        if isinstance(docs, Document) or issubclass(docs.__class__, Document):
+        if isinstance(docs, BaseDocument):
             return_one = True
             docs = [docs]
 
+        validator = self._document()
         for doc in docs:
             self._insert_validation(doc)
-            self._document().validate(
-                clean=True, insertion=True, data=doc.to_mongo())
-            raw.append(doc.to_mongo())
+            mongo_doc = doc.to_mongo()
+            validator.validate(clean=True, insertion=True, data=mongo_doc)
+            raw.append(mongo_doc)
 
         with set_write_concern(self._collection, write_concern) as collection:
             insert_func = collection.insert_many
@@ -300,6 +477,11 @@ class BaseQuerySet:
         :param with_limit_and_skip (optional): take any :meth:`limit` or
             :meth:`skip` that has been applied to this cursor into account when
             getting the count
+
+        .. note:: An unfiltered count ignoring limit and skip is read from
+            the collection metadata (``estimated_document_count``), which may
+            be inaccurate on sharded clusters with orphaned documents or
+            after an unclean shutdown.
         """
         if (
             self._limit == 0
@@ -309,6 +491,11 @@ class BaseQuerySet:
         ):
             return 0
 
+        if not with_limit_and_skip and not self._query:
+            count = self._cursor.collection.estimated_document_count()
+            self._cursor_obj = None
+            return count
+
         kwargs = (
             {"limit": self._limit, "skip": self._skip}
             if with_limit_and_skip else {}
@@ -342,19 +529,17 @@ class BaseQuerySet:
             write_concern = {}
         queryset = self.clone()
 
-        if (
-            call_document_delete := (queryset._skip or queryset._limit)  # noqa F841
-            and not _from_doc_delete
-        ):
-            cnt = 0
-            for doc in queryset:
-                doc.delete(**write_concern)
-                cnt += 1
-            return cnt
+        if (queryset._skip or queryset._limit) and not _from_doc_delete:
+            # delete_many can't skip or limit, so fetch the ids of the
+            # matching documents first and delete them in one go.
+            ids = [doc["_id"] for doc in queryset.as_pymongo().only("pk")]
+            query = {"_id": {"$in": ids}}
+        else:
+            query = queryset._query
 
         with set_write_concern(queryset._collection,
                                write_concern) as collection:
-            result = collection.delete_many(queryset._query)
+            result = collection.delete_many(query)
             if result.acknowledged:
                 return result.deleted_count
 
@@ -381,10 +566,9 @@ class BaseQuerySet:
         queryset = self.clone()
         query = queryset._query
         if "__raw__" in update and isinstance(update["__raw__"], list):
-            update = [
-                transform.update(queryset._document, **{"__raw__": u})
-                for u in update["__raw__"]
-            ]
+            # Raw pipeline stages need no field name translation, only a
+            # copy, which is all transform.update would do for them
+            update = [dict(stage) for stage in update["__raw__"]]
         else:
             update = transform.update(queryset._document, **update)
         # If doing an atomic upsert on an inheritable class
@@ -496,11 +680,26 @@ class BaseQuerySet:
 
         :param object_id: the value for the id of the document to look up
         """
-        queryset = self.clone()
-        if queryset._query_obj:
+        if self._query_obj or self._text_filter:
             msg = "Cannot use a filter whilst using `with_id`"
             raise InvalidQueryError(msg)
-        return queryset.filter(pk=object_id).first()
+
+        if self._where_clause:
+            # The $where clause is only applied on cursors
+            return self._scratch().filter(pk=object_id).first()
+
+        if self._none or self._empty:
+            return None
+
+        query = transform.query(self._document, pk=object_id)
+        query.update(self._cls_query)
+        raw_doc = self._read_collection.find_one(
+            query, skip=self._skip or 0, **self._cursor_args)
+        if raw_doc is None or self._as_pymongo:
+            return raw_doc
+
+        doc = self._document._from_son(raw_doc)
+        return self._get_scalar(doc) if self._scalar else doc
 
     def in_bulk(self, object_ids):
         """Retrieve a set of documents by their ids.
@@ -509,29 +708,66 @@ class BaseQuerySet:
         :rtype: dict of ObjectId's as keys and collection-specific
                 Document subclasses as values.
         """
-        doc_map = {}
-
+        # Fetch all the documents in as few batches as possible
         docs = self._collection.find(
-            {"_id": {"$in": object_ids}}, **self._cursor_args)
-        if self._scalar:
-            for doc in docs:
-                doc_map[doc["_id"]] = self._get_scalar(
-                    self._document._from_son(doc))
-        elif self._as_pymongo:
-            for doc in docs:
-                doc_map[doc["_id"]] = doc
-        else:
-            for doc in docs:
-                doc_map[doc["_id"]] = self._document._from_son(
-                    doc,
-                )
+            {"_id": {"$in": object_ids}},
+            batch_size=max(100, len(object_ids)),
+            **self._cursor_args)
 
-        return doc_map
+        from_son = self._document._from_son
+        if self._scalar:
+            get_scalar = self._scalar_getter
+            return {doc["_id"]: get_scalar(from_son(doc)) for doc in docs}
+        if self._as_pymongo:
+            return {doc["_id"]: doc for doc in docs}
+        return {doc["_id"]: from_son(doc) for doc in docs}
 
     def clone(self):
         """Create a copy of the current queryset."""
-        return self._clone_into(self.__class__(self._document,
-                                               self._collection_obj))
+        return self._copy()
+
+    def inplace(self):
+        """Make the chainable builders (``.filter()``, ``.exclude()``,
+        ``.only()``, ``.exclude_fields()``, ``.order_by()``, ``.limit()``,
+        ``.skip()``...) modify this queryset in place instead of cloning it
+        on every step. ::
+
+            qs = BlogPost.objects.inplace()
+            qs.filter(published=True).order_by("-date").limit(10)
+
+        Other methods (e.g. :meth:`get`, :meth:`values` or :meth:`delete`)
+        still work on a copy and leave the queryset unchanged.
+
+        Only use it on a queryset that isn't shared with other code. If it
+        has been evaluated already, the next builder drops its results and
+        cursor, so that it's queried again.
+        """
+        self._inplace = True
+        return self
+
+    def _chain(self):
+        """Return the queryset a chainable builder should modify: this one,
+        with its results reset, if :meth:`inplace` has been called on it, a
+        copy otherwise.
+        """
+        if self._inplace:
+            self._reset_results()
+            return self
+        return self._copy()
+
+    def _reset_results(self):
+        """Drop the cursor and the iteration state, so that the next
+        evaluation runs the query again.
+        """
+        self._cursor_obj = None
+        self._next_result = None
+        self._iter = False
+
+    def _scratch(self):
+        """Return a queryset builders can be chained on without modifying
+        this one, for methods that only use the result internally.
+        """
+        return self._copy() if self._inplace else self
 
     def explain(self):
         """Returns an explain plan record for the query execution.
@@ -539,6 +775,57 @@ class BaseQuerySet:
         """
         return self._cursor.explain()
 
+    def _copy(self):
+        """Return a new queryset with the same properties as this one.
+
+        The new instance is built straight from this queryset's properties
+        without going through ``__init__``, unless a subclass overrides it.
+        """
+        cls = self.__class__
+        if cls.__init__ is not BaseQuerySet.__init__:
+            return self._clone_into(cls(self._document, self._collection_obj))
+
+        props = self.__dict__
+        state = {prop: props[prop] for prop in _CLONED_PROPS}
+        for prop, copier in _PROP_COPIERS.items():
+            state[prop] = copier(state[prop])
+        state["_document"] = self._document
+        state["_collection_obj"] = self._collection_obj
+        state["_cursor_obj"] = self._cursor_obj.clone() \
+            if self._cursor_obj else None
+
+        new_qs = object.__new__(cls)
+        new_qs.__dict__ = state
+        return new_qs
+
+    def _clone_light(self):
+        """Like :meth:`_chain`, but the new queryset shares its query object
+        and the other mutable properties with this one, except for the
+        loaded fields and ordering, which are cheap to copy and modified in
+        place by in-place builders. It gets a fresh cursor.
+
+        Only use it in methods that just reassign scalar properties (e.g.
+        :meth:`timeout`).
+        """
+        if self._inplace:
+            return self._chain()
+
+        cls = self.__class__
+        if cls.__init__ is not BaseQuerySet.__init__:
+            return self._copy()
+
+        props = self.__dict__
+        state = {prop: props[prop] for prop in _CLONED_PROPS}
+        state["_loaded_fields"] = self._loaded_fields.clone()
+        state["_ordering"] = _copy_value(self._ordering)
+        state["_document"] = self._document
+        state["_collection_obj"] = self._collection_obj
+        state["_cursor_obj"] = None
+
+        new_qs = object.__new__(cls)
+        new_qs.__dict__ = state
+        return new_qs
+
     def _clone_into(self, new_qs):
         """Copy all of the relevant properties of this queryset to
         a new queryset (which has to be an instance of
@@ -549,31 +836,11 @@ class BaseQuerySet:
                 f"{new_qs.__name__} is not a subclass of BaseQuerySet"
             )
 
-        copy_props = (
-            "_mongo_query",
-            "_cls_query",
-            "_none",
-            "_query_obj",
-            "_where_clause",
-            "_loaded_fields",
-            "_ordering",
-            "_timeout",
-            "_allow_disk_use",
-            "_read_preference",
-            "_read_concern",
-            "_iter",
-            "_scalar",
-            "_as_pymongo",
-            "_limit",
-            "_skip",
-            "_empty",
-            "_search_text",
-            "_batch_size",
-        )
-
-        for prop in copy_props:
+        for prop, copier in _CLONED_PROP_COPIERS:
             val = getattr(self, prop)
-            setattr(new_qs, prop, copy.copy(val))
+            if copier is not None:
+                val = copier(val)
+            setattr(new_qs, prop, val)
 
         if self._cursor_obj:
             new_qs._cursor_obj = self._cursor_obj.clone()
@@ -597,7 +864,7 @@ class BaseQuerySet:
         :param n: the maximum number of objects to return if n > 0.
         When 0 is passed, returns all the documents in the cursor
         """
-        queryset = self.clone()
+        queryset = self._chain()
         queryset._limit = n
         queryset._empty = False  # cancels the effect of empty
 
@@ -613,7 +880,7 @@ class BaseQuerySet:
 
         :param n: the number of objects to skip before returning results
         """
-        queryset = self.clone()
+        queryset = self._chain()
         queryset._skip = n
 
         # If a cursor object has already been created, apply the skip to it.
@@ -622,13 +889,29 @@ class BaseQuerySet:
 
         return queryset
 
-    def batch_size(self, size):
+    def batch_size(self, size, force=False):
         """Limit the number of documents returned in a single batch (each
         batch requires a round trip to the server).
 
+        By default the server returns up to 16 MiB of documents per batch,
+        so a small batch size mostly multiplies the round trips. Sizes below
+        ``MIN_BATCH_SIZE`` are therefore ignored, with a warning, unless
+        `force` is True.
+
         :param size: desired size of each batch.
+        :param force: apply `size` even if it's below ``MIN_BATCH_SIZE``.
         """
-        queryset = self.clone()
+        if size < MIN_BATCH_SIZE and not force:
+            warnings.warn(
+                f"Ignoring batch size {size}, below {MIN_BATCH_SIZE}, in "
+                "favour of the server's default batching. Pass force=True "
+                "to apply it anyway.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            return self._chain()
+
+        queryset = self._clone_light()
         queryset._batch_size = size
 
         # If a cursor object has already been created,
@@ -693,34 +976,39 @@ class BaseQuerySet:
         """
 
         # Check for an operator and transform to mongo-style if there is
-        operators = ["slice", "elemMatch"]
         cleaned_fields = []
         for key, value in kwargs.items():
-            parts = key.split("__")
-            if parts[0] in operators:
-                op = parts.pop(0)
+            op, _, rest = key.partition("__")
+            if op in PROJECTION_OPERATORS:
                 value = {f"${op}": value}
-            key = ".".join(parts)
-            cleaned_fields.append((key, value))
-
-        # Sort fields by their values, explicitly excluded fields first, then
-        # explicitly included, and then more complicated operators such as
-        # $slice.
-        def _sort_key(field_tuple):
-            _, value = field_tuple
-            return value if isinstance(value, int) else 2
-
-        fields = sorted(cleaned_fields, key=_sort_key)
-
-        # Clone the queryset, group all fields by their value, convert
-        # each of them to db_fields, and set the queryset's _loaded_fields
-        queryset = self.clone()
-        for value, group in itertools.groupby(fields, lambda x: x[1]):
-            fields = [field for field, value in group]
-            fields = queryset._fields_to_dbfields(fields)
+                key = rest
+            cleaned_fields.append((key.replace("__", "."), value))
+
+        # Group fields by their value in a single pass. Integer values are
+        # explicit exclusions (0) and inclusions (1), other values come from
+        # operators such as $slice, which aren't hashable and are only grouped
+        # with the preceding field when their values are equal.
+        value_groups = {}
+        operator_groups = []
+        for key, value in cleaned_fields:
+            if isinstance(value, int):
+                value_groups.setdefault(value, []).append(key)
+            elif operator_groups and operator_groups[-1][0] == value:
+                operator_groups[-1][1].append(key)
+            else:
+                operator_groups.append((value, [key]))
+
+        # Clone the queryset, convert each group of fields to db_fields and
+        # set the queryset's _loaded_fields, explicitly excluded fields first,
+        # then explicitly included, and then the operators.
+        queryset = self._chain()
+        fields_to_dbfields = queryset._fields_to_dbfields
+        for value, fields in sorted(value_groups.items()) + operator_groups:
             queryset._loaded_fields += QueryFieldList(
-                fields, value=value, _only_called=_only_called
+                fields_to_dbfields(fields), value=value,
+                _only_called=_only_called
             )
+        queryset._cursor_args_cache = None
 
         return queryset
 
@@ -730,10 +1018,11 @@ class BaseQuerySet:
 
             post = BlogPost.objects.exclude('comments').all_fields()
         """
-        queryset = self.clone()
+        queryset = self._chain()
         queryset._loaded_fields = QueryFieldList(
             always_include=queryset._loaded_fields.always_include
         )
+        queryset._cursor_args_cache = None
         return queryset
 
     def order_by(self, *keys):
@@ -747,7 +1036,7 @@ class BaseQuerySet:
         :param keys: fields to order the query results by; keys may be
             prefixed with "+" or a "-" to determine the ordering direction.
         """
-        queryset = self.clone()
+        queryset = self._chain()
 
         old_ordering = queryset._ordering
         new_ordering = queryset._get_order_by(keys)
@@ -778,7 +1067,7 @@ class BaseQuerySet:
 
         Scan the code for `_cls_query` to get more details.
         """
-        queryset = self.clone()
+        queryset = self._clone_light()
         queryset._cls_query = {}
         return queryset
 
@@ -789,8 +1078,9 @@ class BaseQuerySet:
 
         :param enabled: whether or not temporary files on disk are used
         """
-        queryset = self.clone()
+        queryset = self._clone_light()
         queryset._allow_disk_use = enabled
+        queryset._cursor_args_cache = None
         return queryset
 
     def timeout(self, enabled):
@@ -798,8 +1088,9 @@ class BaseQuerySet:
 
         :param enabled: whether or not the timeout is used
         """
-        queryset = self.clone()
+        queryset = self._clone_light()
         queryset._timeout = enabled
+        queryset._cursor_args_cache = None
         return queryset
 
     def read_preference(self, read_preference):
@@ -844,6 +1135,11 @@ class BaseQuerySet:
         """
         queryset = self.clone()
         queryset._scalar = list(fields)
+        # Returns the value, or the tuple of values, of the fields of a
+        # document, see `_get_scalar`
+        queryset._scalar_getter = operator.attrgetter(
+            *(name.replace("__", ".") for name in fields)
+        ) if fields else None
         queryset = queryset.only(*fields) if fields else queryset.all_fields()
         return queryset
 
@@ -855,16 +1151,16 @@ class BaseQuerySet:
         .. note:: This is a command and won't take ordering or limit into
            account.
         """
+        from mongodb.base.fields import BaseField
         from mongodb.fields import ListField
         queryset = self.clone()
 
-        with contextlib.suppress(LookUpError):
+        try:
             field = self._fields_to_dbfields([field]).pop()
+        except LookUpError:
+            pass
         raw_values = queryset._cursor.distinct(field)
 
-        distinct = self._dereference(
-            raw_values, 1, name=field, instance=self._document)
-
         doc_field = self._document._fields.get(field.split(".", 1)[0])
 
         if isinstance(doc_field, ListField):
@@ -878,7 +1174,13 @@ class BaseQuerySet:
                 if isinstance(doc_field, ListField):
                     doc_field = getattr(doc_field, "field", doc_field)
 
-        return distinct
+        # Values of plain fields can't hold references
+        if doc_field is not None and \
+                type(doc_field).__get__ is BaseField.__get__:
+            return raw_values
+
+        return self._dereference(
+            raw_values, 1, name=field, instance=self._document)
 
     def values_list(self, *fields):
         """An alias for scalar"""
@@ -910,8 +1212,23 @@ class BaseQuerySet:
                 ...
             ]
         """
-        cursor = self.only(*fields)
-        return [{field: getattr(obj, field) for field in fields} for obj in cursor]
+        return list(self.values_iter(*fields))
+
+    def values_iter(self, *fields):
+        """Like :meth:`values`, but yield the dictionaries one at a time
+        instead of loading all of them into memory.
+        """
+        plain_fields = self._plain_fields(fields)
+        if plain_fields is None:
+            # The values have to be read from document instances
+            for obj in self._scratch().only(*fields):
+                yield {field: getattr(obj, field) for field in fields}
+            return
+
+        # Plain fields are read straight from the raw documents
+        columns = list(zip(fields, plain_fields))
+        for raw in self._scratch().only(*fields).as_pymongo():
+            yield {name: _raw_field_value(field, raw) for name, field in columns}
 
     def as_pymongo(self):
         """Instead of returning Document instances, return raw values from
@@ -926,23 +1243,84 @@ class BaseQuerySet:
 
     # JSON Helpers
 
-    def to_json(self, *args, **kwargs):
-        """Converts a queryset to JSON"""
-        if "json_options" not in kwargs:
-            warnings.warn(
-                "No 'json_options' are specified! Falling back to "
-                "LEGACY_JSON_OPTIONS with uuid_representation=PYTHON_LEGACY. "
-                "For use with other MongoDB drivers specify the UUID "
-                "representation to use.",
-                DeprecationWarning,
-            )
-            kwargs["json_options"] = LEGACY_JSON_OPTIONS
+    def to_json(self, *args, use_orjson=False, **kwargs):
+        """Converts a queryset to JSON
+
+        :param use_orjson: encode the documents with orjson, if it's
+            installed, which is much faster than ``bson.json_util``. Only
+            used with legacy or relaxed ``json_options`` and no other
+            arguments, since orjson writes numbers natively and can't pass
+            on ``json.dumps`` arguments; otherwise ``bson.json_util`` is
+            used. The output is compact and UUIDs are written as plain
+            strings.
+        """
+        _set_default_json_options(kwargs)
+        json_options = kwargs["json_options"]
+        if (
+            use_orjson
+            and orjson is not None
+            and not args
+            and len(kwargs) == 1
+            and json_options.json_mode in _ORJSON_JSON_MODES
+        ):
+            default = functools.partial(
+                json_util.default, json_options=json_options)
+            return orjson.dumps(
+                list(self.as_pymongo()),
+                default=default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            ).decode()
         return json_util.dumps(self.as_pymongo(), *args, **kwargs)
 
+    def to_json_stream(self, fp, *args, **kwargs):
+        """Write the queryset to the file-like object `fp` as a JSON array,
+        encoding one document at a time instead of the whole result set.
+
+        :param fp: an object with a ``write`` method, e.g. an open file or
+            a streaming HTTP response
+        :param args, kwargs: passed down to ``bson.json_util.dumps`` for
+            each document
+        """
+        _set_default_json_options(kwargs)
+        fp.write("[")
+        separator = ""
+        for raw in self.as_pymongo():
+            fp.write(separator)
+            fp.write(json_util.dumps(raw, *args, **kwargs))
+            separator = ", "
+        fp.write("]")
+
     def from_json(self, json_data):
         """Converts json data to unsaved objects"""
         son_data = json_util.loads(json_data)
-        return [self._document._from_son(data) for data in son_data]
+        from_son = self._document._from_son
+        return [from_son(data) for data in son_data]
+
+    def iter_from_json(self, lines):
+        """Converts newline-delimited json data (one document per line) to
+        unsaved objects, yielding them one at a time.
+
+        :param lines: an iterable of lines, e.g. an open file
+        """
+        from_son = self._document._from_son
+        for line in lines:
+            if line.strip():
+                yield from_son(json_util.loads(line))
+
+    def iter_from_bson(self, bson_data):
+        """Converts concatenated BSON documents to unsaved objects, yielding
+        them one at a time.
+
+        :param bson_data: the BSON documents as bytes, or a file opened in
+            binary mode
+        """
+        if hasattr(bson_data, "read"):
+            documents = bson.decode_file_iter(bson_data)
+        else:
+            documents = bson.decode_iter(bson_data)
+        from_son = self._document._from_son
+        for son in documents:
+            yield from_son(son)
 
     def aggregate(self, pipeline, **kwargs):
         """Perform a aggregate function based in your queryset params
@@ -951,55 +1329,76 @@ class BaseQuerySet:
         :param kwargs: (optional) kwargs dictionary
             to be passed to pymongo's aggregate call
         """
-        user_pipeline = [pipeline] if isinstance(
-            pipeline, dict) else list(pipeline)
-
-        initial_pipeline = []
+        final_pipeline = []
+        append = final_pipeline.append
         if self._query:
-            initial_pipeline.append({"$match": self._query})
+            append({"$match": self._query})
 
         if self._ordering:
-            initial_pipeline.append({"$sort": dict(self._ordering)})
+            append({"$sort": dict(self._ordering)})
 
         if self._limit is not None:
-            initial_pipeline.append(
-                {"$limit": self._limit + (self._skip or 0)})
+            append({"$limit": self._limit + (self._skip or 0)})
 
         if self._skip is not None:
-            initial_pipeline.append({"$skip": self._skip})
-
-        final_pipeline = initial_pipeline + user_pipeline
+            append({"$skip": self._skip})
 
-        collection = self._collection
-        if self._read_preference is not None or self._read_concern is not None:
-            collection = self._collection.with_options(
-                read_preference=self._read_preference,
-                read_concern=self._read_concern
-            )
+        if isinstance(pipeline, dict):
+            append(pipeline)
+        else:
+            final_pipeline.extend(pipeline)
 
-        return collection.aggregate(final_pipeline, cursor={}, **kwargs)
+        return self._read_collection.aggregate(
+            final_pipeline, cursor={}, **kwargs)
 
     # Iterator helpers
 
     def __next__(self):
         """Wrap the result in a :class:`~mongodb.Document` object."""
+        next_result = self._next_result or self._set_next_result()
+        return next_result(self)
+
+    def _set_next_result(self):
+        """Pick the function returning the next result for this queryset's
+        flags, so that they aren't checked again for every result.
+        """
         if self._none or self._empty:
-            raise StopIteration
+            next_result = BaseQuerySet._next_none
+        elif self._as_pymongo:
+            next_result = BaseQuerySet._next_raw
+        elif self._scalar:
+            self._scalar_fields = self._plain_fields(self._scalar)
+            if self._scalar_fields is not None:
+                next_result = BaseQuerySet._next_raw_scalar
+            else:
+                next_result = BaseQuerySet._next_scalar
+        else:
+            next_result = BaseQuerySet._next_doc
+        self._next_result = next_result
+        return next_result
 
-        raw_doc = next(self._cursor)
+    def _next_none(self):
+        raise StopIteration
 
-        if self._as_pymongo:
-            return raw_doc
+    def _next_raw(self):
+        return next(self._cursor)
 
-        doc = self._document._from_son(
-            raw_doc,
-        )
+    def _next_doc(self):
+        return self._document._from_son(next(self._cursor))
 
-        return self._get_scalar(doc) if self._scalar else doc
+    def _next_raw_scalar(self):
+        raw = next(self._cursor)
+        data = [_raw_field_value(field, raw) for field in self._scalar_fields]
+        return data[0] if len(data) == 1 else tuple(data)
+
+    def _next_scalar(self):
+        return self._scalar_getter(
+            self._document._from_son(next(self._cursor)))
 
     def rewind(self):
         """Rewind the cursor to its unevaluated state."""
         self._iter = False
+        self._next_result = None
         self._cursor.rewind()
 
     # Properties
@@ -1011,8 +1410,33 @@ class BaseQuerySet:
         """
         return self._collection_obj
 
+    @property
+    def _read_collection(self):
+        """The collection to read from, with this queryset's read preference
+        and read concern applied. The collection object is cached, and
+        shared with clones, as long as they're unchanged.
+        """
+        read_preference = self._read_preference
+        read_concern = self._read_concern
+        if read_preference is None and read_concern is None:
+            return self._collection
+
+        cached = self._read_collection_cache
+        if cached is None or cached[0] is not read_preference \
+                or cached[1] is not read_concern:
+            collection = self._collection.with_options(
+                read_preference=read_preference,
+                read_concern=read_concern
+            )
+            self._read_collection_cache = cached = (
+                read_preference, read_concern, collection)
+        return cached[2]
+
     @property
     def _cursor_args(self):
+        if self._cursor_args_cache is not None:
+            return self._cursor_args_cache
+
         fields_name = "projection"
         cursor_args = {}
         if not self._timeout:
@@ -1032,6 +1456,7 @@ class BaseQuerySet:
 
             cursor_args[fields_name]["_text_score"] = {"$meta": "textScore"}
 
+        self._cursor_args_cache = cursor_args
         return cursor_args
 
     @property
@@ -1046,14 +1471,8 @@ class BaseQuerySet:
         # XXX In PyMongo 3+, we define the read preference on a collection
         # level, not a cursor level. Thus, we need to get a cloned collection
         # object using `with_options` first.
-        if self._read_preference is not None or self._read_concern is not None:
-            self._cursor_obj = self._collection.with_options(
-                read_preference=self._read_preference,
-                read_concern=self._read_concern
-            ).find(self._query, **self._cursor_args)
-        else:
-            self._cursor_obj = self._collection.find(
-                self._query, **self._cursor_args)
+        self._cursor_obj = self._read_collection.find(
+            self._query, **self._cursor_args)
 
         # Apply "where" clauses to cursor
         if self._where_clause:
@@ -1088,7 +1507,8 @@ class BaseQuerySet:
 
     def __deepcopy__(self, memo):
         """Essential for chained queries with ReferenceFields involved"""
-        return self.clone()
+        # Always a real copy, even for an in-place queryset
+        return self._copy()
 
     @property
     def _query(self):
@@ -1100,6 +1520,8 @@ class BaseQuerySet:
                         "$and": [self._cls_query, self._mongo_query]}
                 else:
                     self._mongo_query.update(self._cls_query)
+            if self._text_filter:
+                self._mongo_query.update(self._text_filter)
         return self._mongo_query
 
     @property
@@ -1114,16 +1536,8 @@ class BaseQuerySet:
     def _fields_to_dbfields(self, fields):
         """Translate fields' paths to their db equivalents."""
 
-        db_field_paths = []
-        for field in fields:
-            field_parts = field.split(".")
-            field = ".".join(
-                f if isinstance(f, str) else f.db_column
-                for f in self._document._lookup_field(field_parts)
-            )
-            db_field_paths.append(field)
-
-        return db_field_paths
+        document = self._document
+        return [_db_field_path(document, field) for field in fields]
 
     def _get_order_by(self, keys):
         """Given a list of mongodb-style sort keys, return a list
@@ -1133,38 +1547,27 @@ class BaseQuerySet:
         >>> qs._get_order_by(['-last_name', 'first_name'])
         [('last_name', -1), ('first_name', 1)]
         """
-        key_list = []
-        for key in keys:
-            if not key:
-                continue
-
-            if key == "$text_score":
-                key_list.append(("_text_score", {"$meta": "textScore"}))
-                continue
-
-            direction = pymongo.ASCENDING
-            if key[0] == "-":
-                direction = pymongo.DESCENDING
-
-            if key[0] in ("-", "+"):
-                key = key[1:]
-
-            key = key.replace("__", ".")
-            with contextlib.suppress(Exception):
-                key = self._document._translate_field_name(key)
-            key_list.append((key, direction))
-
-        return key_list
+        return list(_parse_order_by(self._document, tuple(keys)))
 
     def _get_scalar(self, doc):
-        def lookup(obj, name):
-            chunks = name.split("__")
-            for chunk in chunks:
-                obj = getattr(obj, chunk)
-            return obj
+        return self._scalar_getter(doc)
 
-        data = [lookup(doc, n) for n in self._scalar]
-        return data[0] if len(data) == 1 else tuple(data)
+    def _plain_fields(self, names):
+        """Return the fields named `names`, or None if the value of any of
+        them can't be read straight from a raw document, e.g. a nested field
+        or a list or dict field, whose references are dereferenced when read
+        from a document instance.
+        """
+        from mongodb.base.fields import BaseField
+        document = self._document
+        fields = []
+        for name in names:
+            field = document._fields.get(
+                document._meta["id_field"] if name == "pk" else name)
+            if field is None or type(field).__get__ is not BaseField.__get__:
+                return None
+            fields.append(field)
+        return fields
 
     def _sub_js_fields(self, code):
         """When fields are specified with [~fieldname] syntax, where
@@ -1173,24 +1576,20 @@ class BaseQuerySet:
         :attr:`name` keyword argument in a field's constructor).
         """
 
+        document = self._document
+
         def field_sub(match):
-            # Extract just the field name, and look up the field objects
-            field_name = match.group(1).split(".")
-            fields = self._document._lookup_field(field_name)
-            # Substitute the correct name for the field into the javascript
-            return f'["{fields[-1].db_column}"]'
+            # Substitute the db name of the last field of the path into the
+            # javascript
+            db_path = _db_field_path(document, match.group(1))
+            return f'["{db_path.rsplit(".", 1)[-1]}"]'
 
         def field_path_sub(match):
-            # Extract just the field name, and look up the field objects
-            field_name = match.group(1).split(".")
-            fields = self._document._lookup_field(field_name)
-            # Substitute the correct name for the field into the javascript
-            return ".".join([f.db_column for f in fields])
-
-        code = re.sub(r"\[\s*~([A-z_][A-z_0-9.]+?)\s*\]", field_sub, code)
-        code = re.sub(
-            r"\{\{\s*~([A-z_][A-z_0-9.]+?)\s*\}\}", field_path_sub, code)
-        return code
+            # Substitute the db path of the field into the javascript
+            return _db_field_path(document, match.group(1))
+
+        code = _JS_FIELD_RE.sub(field_sub, code)
+        return _JS_FIELD_PATH_RE.sub(field_path_sub, code)
 
     def _chainable_method(self, method_name, val):
         """Call a particular method on the PyMongo cursor call
@@ -16,8 +16,8 @@ class QueryFieldList:
            otherwise it performs a union.
         """
         self.value = value
-        self.fields = set(fields or [])
-        self.always_include = set(always_include or [])
+        self.fields = set(fields) if fields else set()
+        self.always_include = set(always_include) if always_include else set()
         self._id = None
         self._only_called = _only_called
         self.slice = {}
@@ -52,7 +52,7 @@ class QueryFieldList:
 
         if self.always_include:
             if self.value == self.ONLY and self.fields and \
-                    sorted(self.slice.keys()) != sorted(self.fields):
+                    self.slice.keys() != self.fields:
                 self.fields = self.fields.union(self.always_include)
             else:
                 self.fields -= self.always_include
@@ -64,6 +64,17 @@ class QueryFieldList:
     def __bool__(self):
         return bool(self.fields)
 
+    def clone(self):
+        """Return a copy of this field list. Unlike `copy.copy`, the field
+        sets and slices are copied too, as `__add__` updates them in place.
+        """
+        new = object.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new.fields = self.fields.copy()
+        new.always_include = self.always_include.copy()
+        new.slice = self.slice.copy()
+        return new
+
     def as_dict(self):
         field_list = {field: self.value for field in self.fields}
         if self.slice:
@@ -79,5 +90,5 @@ class QueryFieldList:
 
     def _clean_slice(self):
         if self.slice:
-            for field in set(self.slice.keys()) - self.fields:
+            for field in self.slice.keys() - self.fields:
                 del self.slice[field]
@@ -16,12 +16,32 @@ class QuerySetManager:
     , probably the same one that was passed in, but modified in some way.
     """
 
-    get_queryset = None
+    __slots__ = ("get_queryset", "_apply_queryset_func")
+
     default = QuerySet
 
     def __init__(self, queryset_func=None):
-        if queryset_func:
+        # Subclasses may define `get_queryset` as a method instead
+        if queryset_func or not hasattr(self, "get_queryset"):
             self.get_queryset = queryset_func
+        self._apply_queryset_func = self._get_queryset_applier()
+
+    def _get_queryset_applier(self):
+        """
+        Returns a callable taking the document class and the new queryset
+        that applies `get_queryset` according to its number of arguments,
+        or None when there is no custom queryset function.
+        """
+        get_queryset = self.get_queryset
+        if not get_queryset:
+            return None
+
+        arg_count = get_queryset.__code__.co_argcount
+        if arg_count == 1:
+            return lambda owner, queryset: get_queryset(queryset)
+        elif arg_count == 2:
+            return get_queryset
+        return lambda owner, queryset: partial(get_queryset, owner, queryset)
 
     def __get__(self, instance, owner):
         """
@@ -36,12 +56,7 @@ class QuerySetManager:
         queryset_class = owner._meta.get("queryset_class", self.default)
         queryset = queryset_class(owner, owner._get_collection())
 
-        if self.get_queryset:
-            arg_count = self.get_queryset.__code__.co_argcount
-            if arg_count == 1:
-                queryset = self.get_queryset(queryset)
-            elif arg_count == 2:
-                queryset = self.get_queryset(owner, queryset)
-            else:
-                queryset = partial(self.get_queryset, owner, queryset)
-        return queryset
+        apply_queryset_func = self._apply_queryset_func
+        if apply_queryset_func is None:
+            return queryset
+        return apply_queryset_func(owner, queryset)
@@ -1,5 +1,4 @@
 import contextlib
-import copy
 
 from mongodb.errors import InvalidQueryError
 from mongodb.queryset import transform
@@ -36,19 +35,24 @@ class SimplificationVisitor(QNodeVisitor):
         return combination
 
     def _query_conjunction(self, queries):
-        """Merges query dicts - effectively &ing them together."""
-        query_ops = set()
+        """Merges query dicts - effectively &ing them together.
+
+        The values are shared with the given queries, not copied, as
+        compiling a query never modifies them.
+        """
         combined_query = {}
+        query_ops = combined_query.keys()
         for query in queries:
-            ops = set(query.keys())
-            if intersection := ops.intersection(query_ops):
+            if query_ops & query.keys():
                 raise DuplicateQueryConditionsError()
-
-            query_ops.update(ops)
-            combined_query.update(copy.deepcopy(query))
+            combined_query.update(query)
         return combined_query
 
 
+# SimplificationVisitor holds no state, so a single instance is shared
+_simplification_visitor = SimplificationVisitor()
+
+
 class QueryCompilerVisitor(QNodeVisitor):
     """Compiles the nodes in a query tree to a PyMongo-compatible query
     dictionary.
@@ -71,14 +75,34 @@ class QNode:
     AND = 0
     OR = 1
 
+    # Compiled queries by document class, see `to_query`
+    _compiled_queries = None
+
     def to_query(self, document):
-        query = self.accept(SimplificationVisitor())
-        query = query.accept(QueryCompilerVisitor(document))
-        return query
+        """Compile this query tree to a PyMongo query dictionary for the
+        given document class. The result is cached on the node, and shared
+        with its clones, as query trees are never modified once combined.
+        """
+        compiled_queries = self._compiled_queries
+        if compiled_queries is None:
+            compiled_queries = self._compiled_queries = {}
+        query = compiled_queries.get(document)
+        if query is None:
+            query = self.accept(_simplification_visitor)
+            query = query.accept(QueryCompilerVisitor(document))
+            compiled_queries[document] = query
+        # Callers are free to add keys to the returned query
+        return query.copy()
 
     def accept(self, visitor):
         raise NotImplementedError
 
+    def clone(self):
+        """Return a shallow copy of this node."""
+        new = object.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        return new
+
     def _combine(self, other, operation):
         """Combine this node with another node into a QCombination
         object.
@@ -105,13 +129,15 @@ class QCombination(QNode):
     def __init__(self, operation, children):
         self.operation = operation
         self.children = []
+        append = self.children.append
+        extend = self.children.extend
         for node in children:
             # If the child is a combination of the same type, we can merge its
             # children directly into this combinations children
             if isinstance(node, QCombination) and node.operation == operation:
-                self.children += node.children
+                extend(node.children)
             else:
-                self.children.append(node)
+                append(node)
 
     def __repr__(self):
         op = " & " if self.operation == self.AND else " | "
@@ -120,6 +146,26 @@ class QCombination(QNode):
     def __bool__(self):
         return bool(self.children)
 
+    def clone(self):
+        new = super().clone()
+        # `accept` replaces children in place
+        new.children = self.children.copy()
+        return new
+
+    def _combine(self, other, operation):
+        if operation != self.operation or not self or not other:
+            return super()._combine(other, operation)
+
+        # Same result as QCombination(operation, [self, other]), without
+        # walking this combination's children again
+        combination = object.__new__(self.__class__)
+        combination.operation = operation
+        if isinstance(other, QCombination) and other.operation == operation:
+            combination.children = self.children + other.children
+        else:
+            combination.children = [*self.children, other]
+        return combination
+
     def accept(self, visitor):
         for i in range(len(self.children)):
             if isinstance(self.children[i], QNode):
@@ -1,5 +1,4 @@
 import copy
-from collections import OrderedDict
 
 from rest_framework import fields as drf_fields
 from rest_framework import serializers
@@ -16,17 +15,51 @@ from mongodb.errors import ValidationError
 from mongodb.rest_framework import fields as drfm_fields
 from mongodb.rest_framework.repr import serializer_repr
 from mongodb.rest_framework.utils import (COMPOUND_FIELD_TYPES, get_field_info,
-                                          get_field_kwargs, has_default,
+                                          get_field_kwargs,
                                           is_abstract_document)
-from mongodb.rest_framework.validators import UniqueValidator
+
+# Serializer fields accepting `allow_blank`.
+TEXTUAL_FIELD_CLASSES = (drf_fields.CharField, drf_fields.ChoiceField)
+
+# Keyword arguments valid for the field used for document fields with choices.
+CHOICE_FIELD_KWARGS = frozenset({
+    'read_only', 'write_only',
+    'required', 'default', 'initial', 'source',
+    'error_messages', 'validators', 'allow_null', 'allow_blank',
+    'choices'
+})
+
+# Marks serializer classes whose `Meta` does not define a model.
+MISSING_MODEL = object()
+
+
+def get_nested_write_keys(serializer):
+    """
+    Returns a `(nested_keys, dotted_keys)` pair with the names of the nested
+    serializer fields and of the dotted-source fields of the serializer.
+
+    Both only depend on the serializer class, so they are collected once and
+    cached on it.
+    """
+    serializer_class = type(serializer)
+    keys = serializer_class.__dict__.get('_nested_write_keys')
+    if keys is None:
+        fields = serializer.fields
+        keys = (
+            tuple(
+                key for key, field in fields.items()
+                if isinstance(field, serializers.BaseSerializer)
+            ),
+            tuple(key for key, field in fields.items() if '.' in field.source),
+        )
+        serializer_class._nested_write_keys = keys
+    return keys
 
 
 def raise_errors_on_nested_writes(method_name, serializer, validated_data):
-    assert not any(
-        isinstance(field, serializers.BaseSerializer)
-        and (key in validated_data)
-        for key, field in serializer.fields.items()
-    ), (
+    nested_keys, dotted_keys = get_nested_write_keys(serializer)
+
+    assert not any(key in validated_data for key in nested_keys), (
         f'The `.{method_name}()` method does not support writable nested'
         f'fields by default.\nWrite an explicit `.{method_name}()` method for '
         f'serializer `{serializer.__class__.__module__}.{serializer.__class__.__name__}`, '
@@ -34,9 +67,9 @@ def raise_errors_on_nested_writes(method_name, serializer, validated_data):
     )
 
     assert not any(
-        '.' in field.source and (key in validated_data)
+        key in validated_data
         and isinstance(validated_data[key], (list, dict))
-        for key, field in serializer.fields.items()
+        for key in dotted_keys
     ), (
         f'The `.{method_name}()` method does not support writable '
         f'dotted-source fields by default.\nWrite an explicit '
@@ -46,6 +79,26 @@ def raise_errors_on_nested_writes(method_name, serializer, validated_data):
     )
 
 
+def copy_declared_field(field):
+    """
+    Returns a shallow copy of a declared serializer field, which is cheaper
+    than deep-copying it. Its validators and error messages are copied too,
+    so changes made on one serializer instance don't leak into the declared
+    field, and so is the `child` of list fields and list serializers, with
+    the copy as its parent.
+    """
+    field_copy = copy.copy(field)
+    field_copy.error_messages = dict(field.error_messages)
+    if '_validators' in field.__dict__:
+        field_copy._validators = list(field._validators)
+    child = getattr(field, 'child', None)
+    if child is not None:
+        field_copy.child = copy_declared_field(child)
+        # The child is already bound, only its parent changes
+        field_copy.child.parent = field_copy
+    return field_copy
+
+
 class DocumentSerializer(serializers.ModelSerializer):
     """ Serializer for Documents.
 
@@ -71,6 +124,16 @@ class DocumentSerializer(serializers.ModelSerializer):
 
     _saving_instances = True
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # The document class from `Meta.model`, see `get_document`.
+        cls._document = getattr(getattr(cls, 'Meta', None), 'model', MISSING_MODEL)
+        # Declared fields introduced by this class, as opposed to inherited
+        # from its bases; these must all be listed in `Meta.fields`.
+        cls._required_field_names = set(cls._declared_fields).difference(
+            *(getattr(base, '_declared_fields', ()) for base in cls.__bases__)
+        )
+
     def create(self, validated_data):
         raise_errors_on_nested_writes(
             'create', self, validated_data)
@@ -119,18 +182,10 @@ class DocumentSerializer(serializers.ModelSerializer):
         Returns mongodb document instance.
         """
 
-        data = {}
-
-        for key, value in validated_data.items():
-            try:
-                data[key] = value
-            except KeyError:  # this is dynamic data
-                data[key] = value
-
         if not instance:
-            instance = self.get_document()(**data)
+            instance = self.get_document()(**validated_data)
         else:
-            for key, value in data.items():
+            for key, value in validated_data.items():
                 setattr(instance, key, value)
 
         if self._saving_instances:
@@ -154,11 +209,12 @@ class DocumentSerializer(serializers.ModelSerializer):
         'fields' is evaluated lazily and cached afterwards.
         """
 
-        assert hasattr(self.Meta, 'model'), (
+        document = self._document
+        assert document is not MISSING_MODEL, (
             f'''Class {self.__class__.__name__}
                 missing "Meta.model" attribute'''
         )
-        return self.Meta.model
+        return document
 
     def get_fields(self):
         assert hasattr(self, 'Meta'), (
@@ -167,7 +223,6 @@ class DocumentSerializer(serializers.ModelSerializer):
             )
         )
 
-        declared_fields = copy.deepcopy(self._declared_fields)
         model = self.get_document()
 
         if model is None:
@@ -180,6 +235,42 @@ class DocumentSerializer(serializers.ModelSerializer):
 
         # Retrieve metadata about fields & relationships on the document class.
         self.field_info = get_field_info(model)
+        field_specs, hidden_fields = self.get_field_template(model)
+
+        # Instantiate the fields that should be included on the serializer.
+        fields = {}
+
+        for field_name, field_spec in field_specs:
+            if field_spec is None:
+                # The field is explicitly declared on the class.
+                fields[field_name] = copy_declared_field(
+                    self._declared_fields[field_name])
+            else:
+                field_class, field_kwargs = field_spec
+                fields[field_name] = field_class(**field_kwargs)
+
+        # Add in any hidden fields.
+        for field_name, field in hidden_fields.items():
+            fields[field_name] = copy_declared_field(field)
+
+        return fields
+
+    def get_field_template(self, model):
+        """
+        Returns a `(field_specs, hidden_fields)` pair describing the fields
+        of this serializer class for the given document class, where
+        `field_specs` lists `(field_name, (field_class, field_kwargs))` pairs,
+        or `(field_name, None)` for declared fields.
+
+        The template only depends on the serializer class and the document
+        class, so it is built once and cached on the serializer class.
+        """
+        serializer_class = type(self)
+        template = serializer_class.__dict__.get('_field_template')
+        if template is not None and template[0] is model:
+            return template[1], template[2]
+
+        declared_fields = self._declared_fields
         field_names = self.get_field_names(declared_fields, self.field_info)
         # Determine any extra field arguments and hidden fields that
         # should be included
@@ -187,16 +278,15 @@ class DocumentSerializer(serializers.ModelSerializer):
         extra_kwargs, hidden_fields = self.get_uniqueness_extra_kwargs(
             field_names, extra_kwargs)
 
-        # Determine the fields that should be included on the serializer.
-        fields = OrderedDict()
+        field_specs = []
 
         for field_name in field_names:
             # If the field is explicitly declared on the class then use that.
             if field_name in declared_fields:
-                fields[field_name] = declared_fields[field_name]
                 # We assume that in this case no extra_kwargs etc.
                 # should be considered No nested validators or
                 # validate_*() methods need to be applied
+                field_specs.append((field_name, None))
                 continue
 
             # Determine the serializer field class and keyword arguments.
@@ -204,18 +294,15 @@ class DocumentSerializer(serializers.ModelSerializer):
                 field_name, self.field_info, model
             )
 
-            extra_field_kwargs = extra_kwargs.get(field_name, {})
-            field_kwargs = self.include_extra_kwargs(
-                field_kwargs, extra_field_kwargs
-            )
-
-            # Create the serializer field.
-            fields[field_name] = field_class(**field_kwargs)
-
-        # Add in any hidden fields.
-        fields.update(hidden_fields)
+            extra_field_kwargs = extra_kwargs.get(field_name)
+            if extra_field_kwargs:
+                field_kwargs = self.include_extra_kwargs(
+                    field_kwargs, extra_field_kwargs
+                )
+            field_specs.append((field_name, (field_class, field_kwargs)))
 
-        return fields
+        serializer_class._field_template = (model, field_specs, hidden_fields)
+        return field_specs, hidden_fields
 
     def get_field_names(self, declared_fields, info):
         """
@@ -225,8 +312,9 @@ class DocumentSerializer(serializers.ModelSerializer):
         `Meta.exclude` options if they have been specified.
 
         """
-        fields = getattr(self.Meta, 'fields', None)
-        exclude = getattr(self.Meta, 'exclude', None)
+        meta = self.Meta
+        fields = getattr(meta, 'fields', None)
+        exclude = getattr(meta, 'exclude', None)
 
         if fields and fields != ALL_FIELDS and \
                 not isinstance(fields, (list, tuple)):
@@ -255,28 +343,30 @@ class DocumentSerializer(serializers.ModelSerializer):
 
             if exclude is not None:
                 # If `Meta.exclude` is included, then remove those fields.
-                for field_name in exclude:
-                    if '.' not in field_name:
-                        # ignore customization of nested fields -
-                        # they'll be handled separately
-                        assert field_name in fields, (
-                            f"The field '{field_name}' was included on "
-                            f"serializer {self.__class__.__name__} in the "
-                            "'exclude' option, but doesn't match any "
-                            "document field."
-                        )
-                        fields.remove(field_name)
+                # Customization of nested fields is ignored here -
+                # they'll be handled separately
+                excluded = {
+                    field_name for field_name in exclude
+                    if '.' not in field_name
+                }
+                field_name_set = set(fields)
+                for field_name in excluded:
+                    assert field_name in field_name_set, (
+                        f"The field '{field_name}' was included on "
+                        f"serializer {self.__class__.__name__} in the "
+                        "'exclude' option, but doesn't match any "
+                        "document field."
+                    )
+                fields = [
+                    field_name for field_name in fields
+                    if field_name not in excluded
+                ]
 
         else:
             # Ensure that all declared fields have also
             # been included in the `Meta.fields` option.
 
-            required_field_names = set(declared_fields)
-            for cls in self.__class__.__bases__:
-                required_field_names -= set(
-                    getattr(cls, '_declared_fields', []))
-
-            for field_name in required_field_names:
+            for field_name in self._required_field_names:
                 assert field_name in fields, (
                     f"The field '{field_name}' was declared on serializer "
                     f"{self.__class__.__name__}, but has not been included"
@@ -305,8 +395,20 @@ class DocumentSerializer(serializers.ModelSerializer):
 
         return self.build_unknown_field(field_name, document_class)
 
+    def get_field_mapping(self):
+        """
+        Returns the `ClassLookupDict` over `serializer_field_mapping`, built
+        once per serializer class.
+        """
+        serializer_class = type(self)
+        field_mapping = serializer_class.__dict__.get('_field_mapping')
+        if field_mapping is None:
+            field_mapping = ClassLookupDict(self.serializer_field_mapping)
+            serializer_class._field_mapping = field_mapping
+        return field_mapping
+
     def build_standard_field(self, field_name, document_field):
-        field_mapping = ClassLookupDict(self.serializer_field_mapping)
+        field_mapping = self.get_field_mapping()
 
         field_class = field_mapping[document_field]
         field_kwargs = get_field_kwargs(document_field)
@@ -317,21 +419,14 @@ class DocumentSerializer(serializers.ModelSerializer):
             field_class = self.serializer_choice_field
             # Some document fields may introduce kwargs that would not be valid
             # for the choice field. We need to strip these out.
-            valid_kwargs = {
-                'read_only', 'write_only',
-                'required', 'default', 'initial', 'source',
-                'error_messages', 'validators', 'allow_null', 'allow_blank',
-                'choices'
+            field_kwargs = {
+                key: value for key, value in field_kwargs.items()
+                if key in CHOICE_FIELD_KWARGS
             }
-            for key in list(field_kwargs.keys()):
-                if key not in valid_kwargs:
-                    field_kwargs.pop(key)
-
-        if 'regex' in field_kwargs:
+        elif 'regex' in field_kwargs:
             field_class = drf_fields.RegexField
 
-        if not issubclass(field_class, drf_fields.CharField) and \
-                not issubclass(field_class, drf_fields.ChoiceField):
+        if not issubclass(field_class, TEXTUAL_FIELD_CLASSES):
             # `allow_blank` is only valid for textual fields.
             field_kwargs.pop('allow_blank', None)
 
@@ -355,42 +450,10 @@ class DocumentSerializer(serializers.ModelSerializer):
         return field_class, field_kwargs
 
     def get_uniqueness_extra_kwargs(self, field_names, extra_kwargs):
-        # extra_kwargs contains 'default',
-        # 'required', 'validators=[UniqueValidator]'
-        # hidden_fields contains fields involved in
-        # constraints, but missing in serializer fields
-        model = self.get_document()
-
-        hidden_fields = {}
-
-        field_names = set(field_names)
-        unique_fields = set()
-        unique_together_fields = set()
-
-        uniq_extra_kwargs = {
-            field_name: {
-                'required': True,
-                'validators': [UniqueValidator(queryset=model.objects)],
-            }
-            for field_name in unique_fields
-        }
-        for field_name in unique_together_fields:
-            fld = model._fields[field_name]
-            if has_default(fld):
-                uniq_extra_kwargs[field_name] = {'default': fld.default}
-            else:
-                uniq_extra_kwargs[field_name] = {'required': True}
-
-        # Update `extra_kwargs` with any new options.
-        for key, value in uniq_extra_kwargs.items():
-            if key in extra_kwargs:
-                if key == 'validators':
-                    extra_kwargs[key].append(value)
-                extra_kwargs[key].update(value)
-            else:
-                extra_kwargs[key] = value
-
-        return extra_kwargs, hidden_fields
+        # Unique indexes aren't introspected yet, so there are no unique or
+        # unique-together fields to add 'required', 'default' or
+        # UniqueValidator kwargs for, nor hidden fields to add.
+        return extra_kwargs, {}
 
     def __repr__(self):
         return serializer_repr(self, indent=1)
@@ -1,4 +1,6 @@
-from collections import OrderedDict, namedtuple
+from collections import namedtuple
+from functools import lru_cache
+from weakref import WeakKeyDictionary
 
 from mongodb import fields
 
@@ -13,6 +15,10 @@ COMPOUND_FIELD_TYPES = (
     fields.ListField
 )
 
+# Keyword arguments derived from each document field, keyed weakly on the
+# field instance; see `get_field_kwargs`.
+_field_kwargs_cache = WeakKeyDictionary()
+
 
 def is_abstract_document(document):
     return hasattr(document, 'meta') and document.meta.get('abstract', False)
@@ -21,7 +27,20 @@ def is_abstract_document(document):
 def get_field_kwargs(document_field):
     """
     Creating a default instance of a basic non-relational field.
+
+    The result is computed once per document field; callers get a fresh copy
+    they are free to modify.
     """
+    try:
+        return dict(_field_kwargs_cache[document_field])
+    except KeyError:
+        pass
+    kwargs = _build_field_kwargs(document_field)
+    _field_kwargs_cache[document_field] = kwargs
+    return dict(kwargs)
+
+
+def _build_field_kwargs(document_field):
     kwargs = {}
 
     if document_field.primary_key or document_field.db_column == '_id':
@@ -66,17 +85,20 @@ def has_default(document_field):
     return document_field.default is not None or document_field.null
 
 
+@lru_cache(maxsize=None)
 def get_field_info(document):
     """
     Given a document class, returns a `FieldInfo` instance, which is a
     `namedtuple`, containing metadata about the various field types on
     the document including information about their relationships.
+
+    Results are memoized per document class and must be treated as read-only.
     """
     # Deal with the primary key.
     pk = document._fields[document._meta['id_field']]
 
     # Deal with regular fields.
-    fields = OrderedDict()
+    fields = {}
 
     def add_field(name, field):
         if isinstance(field, COMPOUND_FIELD_TYPES):
@@ -93,7 +115,7 @@ def get_field_info(document):
 
     # Shortcut that merges both regular fields and the pk,
     # for simplifying regular field lookup.
-    fields_and_pk = OrderedDict()
+    fields_and_pk = {}
     fields_and_pk['pk'] = pk
     fields_and_pk[getattr(pk, 'name', 'pk')] = pk
     fields_and_pk.update(fields)
@@ -4,6 +4,24 @@ from rest_framework.exceptions import ValidationError
 from mongodb.rest_framework.repr import smart_repr
 
 
+def validate_unique_batch(values, field_name, queryset):
+    """
+    Returns a list of booleans telling, for each of `values`, whether
+    `queryset` already holds a document with that value for `field_name`.
+
+    Bulk operations can use this instead of a :class:`UniqueValidator`
+    query per value: all the values are looked up with a single `$in` query.
+    """
+    # Compare values the way the query sees them, e.g. a string and an
+    # ObjectId for the same id both match.
+    field = queryset._document._lookup_field(field_name.split('__'))[-1]
+    values = [field.prepare_query_value('in', value) for value in values]
+    existing = set(
+        queryset.filter(**{f'{field_name}__in': values}).distinct(field_name)
+    )
+    return [value in existing for value in values]
+
+
 class MongoValidatorMixin():
     def exclude_current_instance(self, queryset, instance):
         return queryset if instance is None else queryset.filter(pk__ne=instance.pk)
@@ -20,11 +38,19 @@ class UniqueValidator(MongoValidatorMixin, validators.UniqueValidator):
         Setting empty string as default lookup for UniqueValidator.
         """
         super().__init__(queryset, message, lookup)
+        # Document field name of the last validated field's source.
+        self._source_attrs = None
+        self._field_name = None
 
     def __call__(self, value, serializer_field):
         # Determine the underlying document field name. This may not be the
-        # same as the serializer field name if `source=<>` is set.
-        field_name = serializer_field.source_attrs[-1]
+        # same as the serializer field name if `source=<>` is set. It's only
+        # resolved again when validating a field with another source.
+        source_attrs = serializer_field.source_attrs
+        if source_attrs is not self._source_attrs:
+            self._field_name = source_attrs[-1]
+            self._source_attrs = source_attrs
+        field_name = self._field_name
         # Determine the existing instance, if this is an update operation.
         instance = getattr(serializer_field.parent, 'instance', None)
 
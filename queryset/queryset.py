@@ -55,6 +55,13 @@ class QuerySet(BaseQuerySet):
             data[-1] = "...(remaining elements truncated)..."
         return repr(data)
 
+    def _reset_results(self):
+        """Also drop the result cache and the cached length."""
+        super()._reset_results()
+        self._has_more = True
+        self._len = None
+        self._result_cache = None
+
     def _iter_results(self):
         """A generator for iterating over the result cache.
 
@@ -1,9 +1,11 @@
+import sys
 from collections import defaultdict
 
+from mongodb.base.common import class_cached
 from mongodb.base.document import BaseDocument
 from mongodb.errors import InvalidQueryError
 
-UPDATE_OPERATORS = {
+UPDATE_OPERATORS = frozenset({
     "set",
     "unset",
     "inc",
@@ -19,8 +21,8 @@ UPDATE_OPERATORS = {
     "min",
     "max",
     "rename",
-}
-COMPARISON_OPERATORS = (
+})
+COMPARISON_OPERATORS = frozenset({
     "ne",
     "gt",
     "gte",
@@ -35,8 +37,8 @@ COMPARISON_OPERATORS = (
     "not",
     "elemMatch",
     "type",
-)
-STRING_OPERATORS = (
+})
+STRING_OPERATORS = frozenset({
     "contains",
     "icontains",
     "startswith",
@@ -49,56 +51,43 @@ STRING_OPERATORS = (
     "iregex",
     "wholeword",
     "iwholeword",
-)
-CUSTOM_OPERATORS = ("match",)
-MATCH_OPERATORS = (
-    COMPARISON_OPERATORS + STRING_OPERATORS + CUSTOM_OPERATORS
-)
+})
+CUSTOM_OPERATORS = frozenset({"match"})
+MATCH_OPERATORS = COMPARISON_OPERATORS | STRING_OPERATORS | CUSTOM_OPERATORS
+# Operators whose query value is prepared as a single value
+SINGULAR_OPERATORS = frozenset(
+    {None, "ne", "gt", "gte", "lt", "lte", "not"}
+) | STRING_OPERATORS
+# Mongo update operators that remove values from lists
+PULL_OPERATORS = frozenset({"pull", "pullAll"})
+# Each update operator mapped to its Mongo equivalent. Every operator is
+# included, so that the mapped value is always one of these (interned)
+# constants and later comparisons on it are identity checks.
+UPDATE_OPERATOR_MAP = {
+    **{op: op for op in UPDATE_OPERATORS},
+    "push_all": "pushAll",
+    "pull_all": "pullAll",
+    "dec": "inc",
+    "add_to_set": "addToSet",
+    "set_on_insert": "setOnInsert",
+}
 
 
 def query(_doc_cls=None, **kwargs):
     """Transform a query from Django-style format to Mongo format."""
     mongo_query = {}
     merge_query = defaultdict(list)
-    for key, value in sorted(kwargs.items()):
-        if key == "__raw__":
-            mongo_query.update(value)
-            continue
+    # A raw query comes first, the other keys are merged into it
+    raw_query = kwargs.pop("__raw__", None)
+    if raw_query:
+        mongo_query.update(raw_query)
+    for key, value in kwargs.items():
 
-        parts = key.rsplit("__")
-        indices = [(i, p) for i, p in enumerate(parts) if p.isdigit()]
-        parts = [part for part in parts if not part.isdigit()]
-        # Check for an operator and transform to mongo-style if there is
-        op = None
-        if len(parts) > 1 and parts[-1] in MATCH_OPERATORS:
-            op = parts.pop()
-
-        # Allow to escape operator-like field name by __
-        if len(parts) > 1 and parts[-1] == "":
-            parts.pop()
-
-        negate = False
-        if len(parts) > 1 and parts[-1] == "not":
-            parts.pop()
-            negate = True
-
-        nested_fields = _get_nested_fields(parts)
+        key, op, negate, field = _parse_query_key(_doc_cls, key)
 
         if _doc_cls:
-            # Switch field names to proper names [set in Field(name='abc')]
-            try:
-                fields = _doc_cls._lookup_field(parts)
-            except Exception as e:
-                raise InvalidQueryError(e) from e
-            parts = []
-            cleaned_fields = _get_cleaned_fields(fields, parts)
-
             # Convert value to proper value
-            field = cleaned_fields[-1]
-
-            singular_ops = [None, "ne", "gt", "gte", "lt", "lte", "not"]
-            singular_ops += STRING_OPERATORS
-            if op in singular_ops:
+            if op in SINGULAR_OPERATORS:
                 value = field.prepare_query_value(op, value)
             elif op in ("in", "nin", "all") and not isinstance(value, dict):
                 # Raise an error if the in/nin/all param is not iterable.
@@ -118,33 +107,82 @@ def query(_doc_cls=None, **kwargs):
         if negate:
             value = {"$not": value}
 
-        for i, part in indices:
-            parts.insert(i, part)
-        parts += nested_fields
-        key = ".".join(parts)
-
         if key not in mongo_query:
             mongo_query[key] = value
         elif isinstance(mongo_query[key], dict) and isinstance(value, dict):
-            mongo_query[key].update(value)
+            # Merge into a new dict, the existing one may come from a raw
+            # query given by the caller
+            mongo_query[key] = {**mongo_query[key], **value}
         else:
             # Store for manually merging later
             merge_query[key].append(value)
 
     # The queryset has been filter in such a way we must manually merge
-    for k, v in merge_query.items():
-        merge_query[k].append(mongo_query[k])
-        del mongo_query[k]
-        if isinstance(v, list):
-            value = [{k: val} for val in v]
-            if "$and" in mongo_query.keys():
-                mongo_query["$and"].extend(value)
-            else:
-                mongo_query["$and"] = value
+    for k, values in merge_query.items():
+        values.append(mongo_query.pop(k))
+        value = [{k: val} for val in values]
+        # Concatenate, an existing "$and" may come from a raw query
+        existing = mongo_query.get("$and")
+        mongo_query["$and"] = existing + value if existing else value
 
     return mongo_query
 
 
+@class_cached
+def _parse_query_key(_doc_cls, key):
+    """Parse a Django-style query key for the given document class.
+
+    Returns a `(mongo_key, op, negate, field)` tuple, where `field` is the
+    field the value is prepared with, or None without a document class.
+    Keys are parsed once per document class, the result is cached on it.
+    """
+    if "__" not in key:
+        # A plain field name: no operator, index or nested field to handle
+        if not _doc_cls:
+            return key, None, False, None
+        field = _lookup_fields(_doc_cls, [key])[0]
+        return field.db_column, None, False, field
+
+    # Split off positional indices, they are put back in place at the end
+    parts = []
+    indices = []
+    for i, part in enumerate(key.split("__")):
+        if part.isdigit():
+            indices.append((i, part))
+        else:
+            parts.append(part)
+    # Check for an operator and transform to mongo-style if there is
+    op = None
+    if len(parts) > 1 and parts[-1] in MATCH_OPERATORS:
+        # Intern the operator, the parsed key is cached and its operator
+        # compared against constants on every query
+        op = sys.intern(parts.pop())
+
+    # Allow to escape operator-like field name by __
+    if len(parts) > 1 and parts[-1] == "":
+        parts.pop()
+
+    negate = False
+    if len(parts) > 1 and parts[-1] == "not":
+        parts.pop()
+        negate = True
+
+    nested_fields = _get_nested_fields(parts)
+
+    field = None
+    if _doc_cls:
+        # Switch field names to proper names [set in Field(name='abc')]
+        fields = _lookup_fields(_doc_cls, parts)
+        parts = []
+        cleaned_fields = _get_cleaned_fields(fields, parts)
+        field = cleaned_fields[-1]
+
+    for i, part in indices:
+        parts.insert(i, part)
+    parts += nested_fields
+    return ".".join(parts), op, negate, field
+
+
 def update(_doc_cls=None, **update):
     """Transform an update spec from Django-style format to Mongo format."""
     mongo_update = {}
@@ -164,21 +202,12 @@ def update(_doc_cls=None, **update):
         op = None
         if parts[0] in UPDATE_OPERATORS:
             op = parts.pop(0)
-            # Convert Pythonic names to Mongo equivalents
-            operator_map = {
-                "push_all": "pushAll",
-                "pull_all": "pullAll",
-                "dec": "inc",
-                "add_to_set": "addToSet",
-                "set_on_insert": "setOnInsert",
-            }
             if op == "dec":
                 # Support decrement by flipping a positive
                 # value's sign and using 'inc'
                 value = -value
-            # If the operator doesn't found from operator map,
-            # the op value will stay unchanged
-            op = operator_map.get(op, op)
+            # Convert Pythonic names to Mongo equivalents
+            op = UPDATE_OPERATOR_MAP[op]
 
         match = None
         if parts[-1] in COMPARISON_OPERATORS:
@@ -190,10 +219,7 @@ def update(_doc_cls=None, **update):
 
         if _doc_cls:
             # Switch field names to proper names [set in Field(name='foo')]
-            try:
-                fields = _doc_cls._lookup_field(parts)
-            except Exception as e:
-                raise InvalidQueryError(e) from e
+            fields = _lookup_fields(_doc_cls, parts)
             parts = []
 
             cleaned_fields = []
@@ -215,39 +241,20 @@ def update(_doc_cls=None, **update):
                         cleaned_fields.append(field.field)
                         appended_sub_field = True
 
-            # Convert value to proper value
             field = cleaned_fields[-2] if appended_sub_field \
                 else cleaned_fields[-1]
 
-            if op == "pull":
-                if field.required or value is not None:
-                    value = _prepare_query_for_iterable(field, op, value) \
-                        if match in ("in", "nin") and \
-                        not isinstance(value, dict) \
-                        else field.prepare_query_value(op, value)
-            elif op == "push" and isinstance(value, (list, tuple, set)):
-                value = [field.prepare_query_value(op, v) for v in value]
-            elif op in (None, "set", "push"):
-                if field.required or value is not None:
-                    value = field.prepare_query_value(op, value)
-            elif op in ("pushAll", "pullAll"):
-                value = [field.prepare_query_value(op, v) for v in value]
-            elif op in ("addToSet", "setOnInsert"):
-                if isinstance(value, (list, tuple, set)):
-                    value = [field.prepare_query_value(op, v) for v in value]
-                elif field.required or value is not None:
-                    value = field.prepare_query_value(op, value)
-            elif op == "unset":
-                value = 1
-            elif op == "inc":
-                value = field.prepare_query_value(op, value)
+            # Convert value to proper value
+            prepare_value = UPDATE_VALUE_PREPARERS.get(op)
+            if prepare_value is not None:
+                value = prepare_value(field, op, value, match)
 
         if match:
             value = {f"${match}": value}
 
         key = ".".join(parts)
 
-        if "pull" in op and "." in key:
+        if "." in key and op in PULL_OPERATORS:
             # Dot operators don't work on pull operations
             # unless they point to a list field
             # Otherwise it uses nested dict syntax
@@ -271,8 +278,8 @@ def update(_doc_cls=None, **update):
                 parts = parts[last_list_field:]
                 parts.insert(0, key)
 
-            parts.reverse()
-            for key in parts:
+            # Nest the value from the innermost part outwards
+            for key in reversed(parts):
                 value = {key: value}
         elif op == "addToSet" and isinstance(value, list):
             value = {key: {"$each": value}}
@@ -303,11 +310,66 @@ def update(_doc_cls=None, **update):
     return mongo_update
 
 
+def _prepare_update_value(field, op, value, match):
+    if field.required or value is not None:
+        value = field.prepare_query_value(op, value)
+    return value
+
+
+def _prepare_update_values(field, op, value, match):
+    prepare_query_value = field.prepare_query_value
+    return [prepare_query_value(op, v) for v in value]
+
+
+def _prepare_update_value_or_values(field, op, value, match):
+    if isinstance(value, (list, tuple, set)):
+        return _prepare_update_values(field, op, value, match)
+    return _prepare_update_value(field, op, value, match)
+
+
+def _prepare_pull_value(field, op, value, match):
+    if not field.required and value is None:
+        return value
+    if match in ("in", "nin") and not isinstance(value, dict):
+        return _prepare_query_for_iterable(field, op, value)
+    return field.prepare_query_value(op, value)
+
+
+# Prepare the value of an update for each Mongo update operator, operators
+# missing here keep their value as given
+UPDATE_VALUE_PREPARERS = {
+    None: _prepare_update_value,
+    "set": _prepare_update_value,
+    "push": _prepare_update_value_or_values,
+    "pushAll": _prepare_update_values,
+    "pull": _prepare_pull_value,
+    "pullAll": _prepare_update_values,
+    "addToSet": _prepare_update_value_or_values,
+    "setOnInsert": _prepare_update_value_or_values,
+    "unset": lambda field, op, value, match: 1,
+    "inc": lambda field, op, value, match: field.prepare_query_value(op, value),
+}
+
+
+def _lookup_fields(doc_cls, parts):
+    """Return the fields on the path given by `parts`, see
+    `BaseDocument._lookup_field`, looking top-level fields up directly.
+    """
+    if len(parts) == 1:
+        field = doc_cls._fields.get(parts[0])
+        if field is not None:
+            return [field]
+    try:
+        return doc_cls._lookup_field(parts)
+    except Exception as e:
+        raise InvalidQueryError(e) from e
+
+
 def _get_nested_fields(parts):
-    nested_fields = []
-    if len(parts) > 1:
-        nested_fields = parts[1:].copy()
-        del parts[1:]
+    if len(parts) < 2:
+        return []
+    nested_fields = parts[1:]
+    del parts[1:]
     return nested_fields
 
 
@@ -345,4 +407,5 @@ def _prepare_query_for_iterable(field, op, value):
             applied to an iterable (e.g. a list)."""
         )
 
-    return [field.prepare_query_value(op, v) for v in value]
+    prepare_query_value = field.prepare_query_value
+    return [prepare_query_value(op, v) for v in value]
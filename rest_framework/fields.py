@@ -8,12 +8,15 @@ class ObjectIdField(serializers.Field):
     """ Field for ObjectId values """
 
     def to_internal_value(self, value):
+        if isinstance(value, ObjectId):
+            return value
         try:
-            return ObjectId(smart_str(value))
+            return ObjectId(value if isinstance(value, str)
+                            else smart_str(value))
         except InvalidId as e:
             raise serializers.ValidationError(
                 f"'{value}' is not a valid ObjectId"
             ) from e
 
     def to_representation(self, value):
-        return smart_str(value)
+        return str(value) if isinstance(value, ObjectId) else smart_str(value)
@@ -35,6 +35,11 @@ def mongo_doc_repr(value):
 
 
 uni_lit_re = re.compile("u'(.*?)'")
+hex_address_re = re.compile(' at 0x[0-9a-f]{4,32}>')
+
+# Types whose repr never needs the substitutions below. Strings are left
+# out, their repr may contain anything.
+SCALAR_TYPES = frozenset({int, float, bool, type(None)})
 
 
 def smart_repr(value):
@@ -47,17 +52,23 @@ def smart_repr(value):
     if isinstance(value, Field):
         return field_repr(value)
 
+    if type(value) in SCALAR_TYPES:
+        # Nothing to clean up in the repr of these
+        return repr(value)
+
     value = repr(value)
 
     # Representations like u'help text'
     # should simply be presented as 'help text'
-    value = uni_lit_re.sub("'\\1'", value)
+    if "u'" in value:
+        value = uni_lit_re.sub("'\\1'", value)
 
     # Representations like
     # <django.core.validators.RegexValidator object at 0x1047af050>
     # Should be presented as
     # <django.core.validators.RegexValidator object>
-    value = re.sub(' at 0x[0-9a-f]{4,32}>', '>', value)
+    if ' at 0x' in value:
+        value = hex_address_re.sub('>', value)
 
     return value
 
@@ -86,22 +97,22 @@ def field_repr(field, force_many=False):
 
 
 def serializer_repr(serializer, indent, force_many=None):
-    ret = f'{field_repr(serializer, force_many)}:'
+    ret = [f'{field_repr(serializer, force_many)}:']
     indent_str = '    ' * indent
 
     fields = force_many.fields if force_many else serializer.fields
     for field_name, field in fields.items():
-        ret += '\n' + indent_str + field_name + ' = '
+        ret.append(f'\n{indent_str}{field_name} = ')
         if hasattr(field, 'fields'):
-            ret += serializer_repr(field, indent + 1)
+            ret.append(serializer_repr(field, indent + 1))
         else:
-            ret += field_repr(field)
+            ret.append(field_repr(field))
 
     if serializer.validators:
-        ret += f'''\n{indent_str}class Meta:\n{indent_str}
-           validators = {smart_repr(serializer.validators)}'''
+        ret.append(f'''\n{indent_str}class Meta:\n{indent_str}
+           validators = {smart_repr(serializer.validators)}''')
 
     if len(fields) == 0:
-        ret += "\npass"
+        ret.append("\npass")
 
-    return ret
+    return ''.join(ret)
@@ -2,6 +2,7 @@
 """
 Simple test script to verify the mongodb-rest package works correctly.
 """
+import pytest
 
 
 def test_imports():
@@ -53,6 +54,493 @@ def test_basic_functionality():
         return False
 
 
+
+@pytest.fixture
+def person_cls():
+    """A document class bound to an in-memory mongomock database, holding
+    three documents.
+    """
+    mongomock = pytest.importorskip("mongomock")
+    from mongodb import connection
+    from mongodb.fields import CharField, IntegerField
+
+    connection._connection_settings["default"] = {"name": "test"}
+    connection._connections["default"] = mongomock.MongoClient()
+    connection._dbs["default"] = connection._connections["default"]["test"]
+
+    from mongodb import Document
+
+    class Person(Document):
+        name = CharField(max_length=50)
+        age = IntegerField()
+        meta = {"collection": "people"}
+
+    Person.objects.delete()
+    for name, age in (("n1", 10), ("n2", 20), ("n3", 30)):
+        Person(name=name, age=age).save()
+    yield Person
+    connection.disconnect()
+
+
+def test_inplace_queryset_reuse(person_cls):
+    """Methods other than the chainable builders leave an in-place
+    queryset unchanged."""
+    qs = person_cls.objects.inplace().order_by("-age")
+    assert qs.filter(age__gte=10) is qs
+
+    assert qs.get(name="n1").age == 10
+    assert qs.get(name="n2").age == 20
+    assert qs.first().name == "n3"
+    assert qs.values("name") == [{"name": "n3"}, {"name": "n2"}, {"name": "n1"}]
+    assert qs.scalar("name").count() == 3
+    assert sorted(qs.distinct("name")) == ["n1", "n2", "n3"]
+
+    qs.update(inc__age=1)
+    assert [p.age for p in person_cls.objects.order_by("name")] == [11, 21, 31]
+    qs.limit(2)
+
+    # Still the same queryset, yielding documents in the same order
+    assert [p.name for p in qs] == ["n3", "n2"]
+    assert qs._limit == 2
+
+    ordered = person_cls.objects.inplace().order_by("name")
+    assert ordered.with_id(ordered.first().pk).name == "n1"
+    assert [p.name for p in ordered.filter(age__gt=15)] == ["n2", "n3"]
+
+    doomed = person_cls.objects.inplace().order_by("name").limit(2)
+    assert doomed.delete() == 2
+    assert [p.name for p in doomed] == ["n3"]
+    assert isinstance(doomed.first(), person_cls)
+
+
+
+def test_validate_unique_batch(person_cls):
+    """Values are compared after the same conversion as the `$in` query."""
+    from django.conf import settings
+    if not settings.configured:
+        settings.configure()
+    from mongodb.rest_framework.validators import validate_unique_batch
+
+    first = person_cls.objects.get(name="n1")
+    assert validate_unique_batch(
+        [str(first.pk), first.pk], "pk", person_cls.objects) == [True, True]
+    assert validate_unique_batch(
+        ["10", 10, 11], "age", person_cls.objects) == [True, True, False]
+    assert validate_unique_batch(
+        (name for name in ["n2", "nope"]), "name",
+        person_cls.objects) == [True, False]
+    assert validate_unique_batch(
+        ["n1"], "name", person_cls.objects.filter(age__gt=10)) == [False]
+    assert validate_unique_batch([], "name", person_cls.objects) == []
+
+
+def test_to_json_orjson_matches_json_util(person_cls):
+    """orjson is only used where it gives the same JSON as json_util."""
+    import json
+    orjson = pytest.importorskip("orjson")
+    from bson import json_util
+    from mongodb.pymongo_support import LEGACY_JSON_OPTIONS
+
+    qs = person_cls.objects.order_by("age")
+    for options in (LEGACY_JSON_OPTIONS, json_util.RELAXED_JSON_OPTIONS,
+                    json_util.CANONICAL_JSON_OPTIONS):
+        assert json.loads(qs.to_json(use_orjson=True, json_options=options)) \
+            == json.loads(qs.to_json(json_options=options))
+
+    # Canonical output and extra json.dumps arguments go through json_util
+    canonical = qs.to_json(
+        use_orjson=True, json_options=json_util.CANONICAL_JSON_OPTIONS)
+    assert '"$numberInt": "10"' in canonical
+    indented = qs.to_json(
+        use_orjson=True, json_options=LEGACY_JSON_OPTIONS, indent=2)
+    assert indented == qs.to_json(json_options=LEGACY_JSON_OPTIONS, indent=2)
+    assert "\n" in indented
+
+
+def test_to_json_stream_matches_to_json(person_cls):
+    """Streamed JSON decodes to the same value as `to_json`."""
+    import io
+    import json
+    from mongodb.pymongo_support import LEGACY_JSON_OPTIONS
+
+    for qs in (person_cls.objects.order_by("age"),
+               person_cls.objects.filter(name="missing")):
+        fp = io.StringIO()
+        qs.to_json_stream(fp, json_options=LEGACY_JSON_OPTIONS)
+        assert json.loads(fp.getvalue()) \
+            == json.loads(qs.to_json(json_options=LEGACY_JSON_OPTIONS))
+    assert fp.getvalue() == "[]"
+
+
+def test_values_matches_values_iter(person_cls, monkeypatch):
+    """`values` and `values_iter` agree on the raw and document paths."""
+    qs = person_cls.objects.order_by("age")
+    expected = [{"name": "n1", "age": 10}, {"name": "n2", "age": 20},
+                {"name": "n3", "age": 30}]
+    assert qs.values("name", "age") == expected
+    assert list(qs.values_iter("name", "age")) == expected
+
+    # Without plain fields the values are read from document instances
+    monkeypatch.setattr(type(qs), "_plain_fields", lambda self, names: None)
+    assert qs.values("name", "age") == expected
+    assert list(qs.values_iter("name", "age")) == expected
+
+
+def test_iter_from_json_and_bson(person_cls):
+    """Documents are read from NDJSON and from concatenated BSON."""
+    import io
+    import bson
+
+    raw = list(person_cls.objects.order_by("age").as_pymongo())
+    lines = [bson.json_util.dumps(doc) + "\n" for doc in raw]
+    lines.insert(1, "\n")
+    lines.append("   \n")
+    people = list(person_cls.objects.iter_from_json(lines))
+    assert [(p.pk, p.name, p.age) for p in people] \
+        == [(d["_id"], d["name"], d["age"]) for d in raw]
+
+    data = b"".join(bson.encode(doc) for doc in raw)
+    for source in (data, io.BytesIO(data)):
+        people = list(person_cls.objects.iter_from_bson(source))
+        assert all(isinstance(p, person_cls) for p in people)
+        assert [(p.pk, p.name, p.age) for p in people] \
+            == [(d["_id"], d["name"], d["age"]) for d in raw]
+
+
+def test_batch_size_minimum(person_cls):
+    """Small batch sizes are ignored with a warning unless forced."""
+    from mongodb.queryset.base import MIN_BATCH_SIZE
+
+    qs = person_cls.objects.all()
+    with pytest.warns(DeprecationWarning, match="force=True"):
+        ignored = qs.batch_size(10)
+    assert ignored._batch_size is None
+    assert ignored.count() == 3
+
+    forced = qs.batch_size(10, force=True)
+    assert forced._batch_size == 10
+    assert [p.name for p in forced.order_by("age")] == ["n1", "n2", "n3"]
+    assert qs.batch_size(MIN_BATCH_SIZE)._batch_size == MIN_BATCH_SIZE
+
+
+def test_declared_field_copies_are_independent(person_cls):
+    """Serializer instances don't share the validators of declared fields."""
+    from django.conf import settings
+    if not settings.configured:
+        settings.configure()
+    from rest_framework import serializers as drf_serializers
+    from mongodb.rest_framework.serializers import DocumentSerializer
+
+    def not_empty(value):
+        if not value:
+            raise drf_serializers.ValidationError("empty")
+
+    class PersonSerializer(DocumentSerializer):
+        extra = drf_serializers.CharField(validators=[not_empty])
+        tags = drf_serializers.ListField(
+            child=drf_serializers.CharField(validators=[not_empty]))
+
+        class Meta:
+            model = person_cls
+            fields = ("name", "extra", "tags")
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.fields["extra"].validators.append(not_empty)
+            self.fields["extra"].error_messages["custom"] = "custom"
+            self.fields["tags"].child.validators.append(not_empty)
+
+    first, second = PersonSerializer(), PersonSerializer()
+    count = len(first.fields["extra"].validators)
+    assert len(second.fields["extra"].validators) == count
+    assert first.fields["extra"].validators \
+        is not second.fields["extra"].validators
+    assert len(second.fields["tags"].child.validators) \
+        == len(first.fields["tags"].child.validators)
+
+    declared = PersonSerializer._declared_fields
+    assert len(declared["extra"].validators) == count - 1
+    assert "custom" not in declared["extra"].error_messages
+    assert len(declared["tags"].child.validators) \
+        == len(first.fields["tags"].child.validators) - 1
+    assert first.fields["tags"].child.parent is first.fields["tags"]
+
+
+def test_inplace_queryset_after_evaluation(person_cls):
+    """In-place builders reset the results of an evaluated queryset."""
+    qs = person_cls.objects.inplace().order_by("name")
+    assert [p.name for p in qs] == ["n1", "n2", "n3"]
+    assert len(qs) == 3
+    qs.filter(name="n2")
+    assert [p.name for p in qs] == ["n2"]
+    assert len(qs) == 1
+    assert qs.count() == 1
+
+    empty = person_cls.objects.order_by("name")[0:0].inplace()
+    assert list(empty) == []
+    empty.limit(2)
+    assert [p.name for p in empty] == ["n1", "n2"]
+
+    # Builders on a light clone reset the cursor as well
+    timed = person_cls.objects.inplace().order_by("name")
+    assert [p.name for p in timed] == ["n1", "n2", "n3"]
+    assert timed.timeout(False) is timed
+    assert timed._cursor_obj is None and timed._result_cache is None
+
+
+def test_light_clone_keeps_source_fields(person_cls):
+    """In-place builders on a light clone leave its source unchanged."""
+    source = person_cls.objects.only("name").order_by("name")
+    light = source.timeout(False).inplace()
+    light.only("age").order_by("-age")
+    assert source._loaded_fields.as_dict() == {"name": 1}
+    assert source._ordering == [("name", 1)]
+    assert light._loaded_fields.as_dict() == {"name": 1, "age": 1}
+    assert [p.name for p in source] == ["n1", "n2", "n3"]
+    assert [p.age for p in source] == [None, None, None]
+
+
+def test_remove_null_values(person_cls):
+    """None values are dropped at every level, including in SON."""
+    from bson import SON
+
+    doc = SON([("a", 1), ("b", None), ("sub", SON([("c", None), ("d", 2)])),
+               ("items", [1, None, {"e": None, "f": [None, 3]}])])
+    assert person_cls()._remove_null_values(doc) == {
+        "a": 1, "sub": {"d": 2}, "items": [1, {"f": [3]}]}
+
+
+def test_unique_validator(person_cls):
+    """UniqueValidator goes through its filter hooks for every field."""
+    import django
+    from django.conf import settings
+    if not settings.configured:
+        settings.configure()
+    django.setup()
+    from rest_framework import serializers as drf_serializers
+    from mongodb.rest_framework.serializers import DocumentSerializer
+    from mongodb.rest_framework.validators import UniqueValidator
+
+    class AdultUniqueValidator(UniqueValidator):
+        def filter_queryset(self, value, queryset, field_name):
+            queryset = super().filter_queryset(value, queryset, field_name)
+            return queryset.filter(age__gte=20)
+
+    shared = UniqueValidator(person_cls.objects)
+
+    class PersonSerializer(DocumentSerializer):
+        name = drf_serializers.CharField(validators=[shared])
+        nick = drf_serializers.CharField(
+            source="name", required=False, validators=[shared])
+        label = drf_serializers.CharField(
+            required=False, validators=[AdultUniqueValidator(
+                person_cls.objects)])
+
+        class Meta:
+            model = person_cls
+            fields = ("name", "nick", "label", "age")
+
+    assert not PersonSerializer(data={"name": "n1", "age": 1}).is_valid()
+    assert PersonSerializer(data={"name": "new", "age": 1}).is_valid()
+    n1 = person_cls.objects.get(name="n1")
+    assert PersonSerializer(n1, data={"name": "n1", "age": 1}).is_valid()
+
+    # The overridden hook only finds n2 and n3
+    label = PersonSerializer().fields["label"]
+    label.source_attrs = ["name"]
+    AdultUniqueValidator(person_cls.objects)("n1", label)
+    with pytest.raises(drf_serializers.ValidationError):
+        AdultUniqueValidator(person_cls.objects)("n2", label)
+
+
+def test_sub_js_fields(person_cls):
+    """Field placeholders in javascript are replaced with db names."""
+    from mongodb.document import Document
+    from mongodb.fields import CharField, IntegerField
+
+    class Customer(Document):
+        score = IntegerField(db_column="s")
+        label = CharField(db_column="l")
+
+    qs = Customer.objects
+    assert qs._sub_js_fields("this[~score] > 1") == 'this["s"] > 1'
+    assert qs._sub_js_fields("this[ ~label ] + this[~score]") \
+        == 'this["l"] + this["s"]'
+    assert qs._sub_js_fields("{{~label}} + {{ ~score }}") == "l + s"
+
+
+def test_count_paths(person_cls, monkeypatch):
+    """Unfiltered counts read the collection metadata, others count."""
+    # A metadata count that differs from the real one shows which is used
+    monkeypatch.setattr(type(person_cls._get_collection()),
+                        "estimated_document_count", lambda self, **kw: 42)
+
+    assert person_cls.objects.count() == 42
+    assert person_cls.objects.limit(1).count() == 42
+    assert person_cls.objects.filter(age__gt=10).count() == 2
+    assert person_cls.objects.skip(1).limit(5).count(
+        with_limit_and_skip=True) == 2
+    assert person_cls.objects.skip(0).limit(1).count(
+        with_limit_and_skip=True) == 1
+    assert person_cls.objects.filter(age__gt=100).count() == 0
+    assert person_cls.objects[0:0].count() == 0
+    assert person_cls.objects.limit(0).count() == 0
+
+
+def test_delete_with_skip_and_limit(person_cls, monkeypatch):
+    """Skipped or limited deletes remove the matching ids in one request."""
+    collection_cls = type(person_cls._get_collection())
+    delete_many = collection_cls.delete_many
+    queries = []
+
+    def recording_delete_many(self, query, *args, **kwargs):
+        queries.append(query)
+        return delete_many(self, query, *args, **kwargs)
+
+    monkeypatch.setattr(collection_cls, "delete_many", recording_delete_many)
+
+    assert person_cls.objects.order_by("age").skip(1).limit(1).delete() == 1
+    assert [p.name for p in person_cls.objects.order_by("age")] == ["n1", "n3"]
+    assert len(queries) == 1 and list(queries[0]) == ["_id"]
+    assert len(queries[0]["_id"]["$in"]) == 1
+
+    assert person_cls.objects.order_by("-age").limit(1).delete() == 1
+    assert [p.name for p in person_cls.objects] == ["n1"]
+    assert person_cls.objects.skip(5).delete() == 0
+
+    del queries[:]
+    assert person_cls.objects.filter(name="n1").delete() == 1
+    assert queries == [{"name": "n1"}]
+
+
+def test_search_text_query(person_cls):
+    """The $text clause is merged into the compiled query only."""
+    from mongodb.errors import InvalidQueryError, OperationError
+
+    qs = person_cls.objects.filter(age__gt=10).search_text("n2", "en")
+    assert qs._query == {"age": {"$gt": 10},
+                         "$text": {"$search": "n2", "$language": "en"}}
+    assert qs._query_obj.to_query(person_cls) == {"age": {"$gt": 10}}
+    assert qs._search_text == "n2"
+
+    negated = person_cls.objects.search_text("n2")(negate_query=True, age=10)
+    assert negated._query == {"$nor": [{"age": 10}],
+                              "$text": {"$search": "n2"}}
+
+    with pytest.raises(OperationError):
+        qs.search_text("again")
+    with pytest.raises(InvalidQueryError):
+        person_cls.objects.search_text("n2").with_id(
+            person_cls.objects.first().pk)
+
+
+def test_with_id(person_cls):
+    """with_id looks up one document and honours the queryset settings."""
+    from bson import ObjectId
+    from mongodb.errors import InvalidQueryError
+
+    n1 = person_cls.objects.get(name="n1")
+    objects = person_cls.objects
+    assert objects.with_id(n1.pk).name == "n1"
+    assert objects.with_id(str(n1.pk)).name == "n1"
+    assert objects.with_id(ObjectId()) is None
+
+    partial = objects.only("name").with_id(n1.pk)
+    assert (partial.name, partial.age) == ("n1", None)
+    assert objects.as_pymongo().with_id(n1.pk) == {
+        "_id": n1.pk, "name": "n1", "age": 10}
+    assert objects.scalar("age").with_id(n1.pk) == 10
+    assert objects.skip(1).with_id(n1.pk) is None
+    assert objects[0:0].with_id(n1.pk) is None
+
+    with pytest.raises(InvalidQueryError):
+        objects.filter(name="n1").with_id(n1.pk)
+
+
+def test_get(person_cls):
+    """get returns the single match or raises for none or several."""
+    from mongodb.queryset.visitor import Q
+
+    person = person_cls.objects.get(name="n1")
+    assert (person.name, person.age) == ("n1", 10)
+    assert person_cls.objects.filter(age__gt=10).get(Q(name="n3")).age == 30
+    assert person_cls.objects.as_pymongo().get(name="n2")["age"] == 20
+    assert person_cls.objects.scalar("age").get(name="n2") == 20
+
+    with pytest.raises(person_cls.DoesNotExist):
+        person_cls.objects.get(name="missing")
+    with pytest.raises(person_cls.MultipleObjectsReturned):
+        person_cls.objects.get(age__gt=10)
+    # Any limit is replaced by the limit of 2 get needs
+    with pytest.raises(person_cls.MultipleObjectsReturned):
+        person_cls.objects.limit(1).get(age__gt=10)
+
+
+def test_has_data(person_cls, monkeypatch):
+    """Truthiness only fetches the _id of the first match."""
+    collection_cls = type(person_cls._get_collection())
+    find_one = collection_cls.find_one
+    projections = []
+
+    def recording_find_one(self, filter=None, *args, **kwargs):
+        projections.append(args[0] if args else kwargs.get("projection"))
+        return find_one(self, filter, *args, **kwargs)
+
+    monkeypatch.setattr(collection_cls, "find_one", recording_find_one)
+
+    assert person_cls.objects
+    assert person_cls.objects.filter(age__gt=20)
+    assert not person_cls.objects.filter(name="missing")
+    assert person_cls.objects.skip(2)
+    assert not person_cls.objects.skip(3)
+    assert projections == [{"_id": 1}] * 5
+
+    assert not person_cls.objects[0:0]
+    assert len(projections) == 5
+
+
+def test_cached_key_translation(person_cls):
+    """Query, order and field path translations are cached per class."""
+    from mongodb.document import Document
+    from mongodb.errors import InvalidQueryError
+    from mongodb.fields import CharField, IntegerField
+    from mongodb.queryset import transform
+    from mongodb.queryset.base import _db_field_path, _parse_order_by
+
+    class Short(Document):
+        name = CharField(db_column="n")
+        age = IntegerField(db_column="a")
+
+    class Long(Document):
+        name = CharField(db_column="full_name")
+        age = IntegerField(db_column="years")
+
+    for _ in range(2):
+        assert transform.query(Short, name="x", age__gt=1) == {
+            "n": "x", "a": {"$gt": 1}}
+        assert transform.query(Long, name="x", age__gt=1) == {
+            "full_name": "x", "years": {"$gt": 1}}
+        assert Short.objects.order_by("-age", "name")._ordering == [
+            ("a", -1), ("n", 1)]
+        assert Long.objects.order_by("-age", "name")._ordering == [
+            ("years", -1), ("full_name", 1)]
+        assert _db_field_path(Short, "age") == "a"
+        assert _db_field_path(Long, "age") == "years"
+
+    # The results are stored on each class, not shared with the others
+    assert vars(Short)["_parse_query_key_cache"]["age__gt"][0] == "a"
+    assert vars(Long)["_parse_query_key_cache"]["age__gt"][0] == "years"
+    assert ("-age", "name") in vars(Long)["_parse_order_by_cache"]
+    assert "_parse_query_key_cache" not in vars(Document)
+    assert transform.query(name="x") == {"name": "x"}
+
+    # Lookup errors aren't cached
+    for _ in range(2):
+        with pytest.raises(InvalidQueryError):
+            transform.query(Short, missing=1)
+    assert "missing" not in vars(Short)["_parse_query_key_cache"]
+
+
 if __name__ == "__main__":
     print("Testing mongodb-rest package...")
     print("=" * 50)